@@ -1,27 +1,367 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse, PlainTextResponse
+from fastapi.encoders import jsonable_encoder
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.routing import Match
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import IndexModel, UpdateOne, ReturnDocument, ASCENDING, DESCENDING, TEXT
+from pymongo import monitoring
+from pymongo.errors import PyMongoError, OperationFailure, DuplicateKeyError, BulkWriteError, ConnectionFailure
 import os
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, Field, EmailStr, ValidationError
+from typing import List, Optional, Dict, Any, Set
 import uuid
-from datetime import datetime, timedelta
+import random
+import socket
+import time
+import asyncio
+import json
+import base64
+import csv
+import io
+import heapq
+import hashlib
+import threading
+import re
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from bisect import bisect_right
+from email.utils import format_datetime, parsedate_to_datetime
 from passlib.context import CryptContext
 import jwt
-from bson import ObjectId
+from bson import ObjectId, json_util
 from enum import Enum
 import httpx
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# ==================== METRICS ====================
+
+# Optional bearer token required by /metrics
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+# Slow query log: threshold, how many entries to keep, and the fraction of
+# slow queries re-run through explain() to check for collection scans
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', '100'))
+SLOW_QUERY_LOG_SIZE = int(os.environ.get('SLOW_QUERY_LOG_SIZE', '200'))
+SLOW_QUERY_EXPLAIN_RATE = float(os.environ.get('SLOW_QUERY_EXPLAIN_RATE', '0.1'))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# Set by MetricsMiddleware for each request; Motor copies it into the
+# executor threads that run commands, so the listener sees it too
+request_context: ContextVar[Optional[dict]] = ContextVar("request_context", default=None)
+
+class Histogram:
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+def prometheus_labels(labels: Dict[str, Any]) -> str:
+    escaped = (
+        f'{k}="' + str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for k, v in labels.items()
+    )
+    return "{" + ",".join(escaped) + "}"
+
+class Metrics:
+    """In-process request and Mongo command metrics in Prometheus text format.
+    
+    Counters are per process; with several workers, scrape each one. Mongo
+    commands are recorded from pymongo's monitoring threads, hence the lock.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: Dict[tuple, int] = {}
+        self.latency: Dict[tuple, Histogram] = {}
+        self.response_size: Dict[tuple, Histogram] = {}
+        self.in_flight: Dict[tuple, int] = {}
+        self.db_commands: Dict[tuple, int] = {}
+        self.db_latency: Dict[tuple, Histogram] = {}
+        self.db_per_request: Dict[str, Histogram] = {}
+    
+    def _histogram(self, family: dict, key, buckets: tuple) -> Histogram:
+        histogram = family.get(key)
+        if histogram is None:
+            histogram = family[key] = Histogram(buckets)
+        return histogram
+    
+    def request_started(self, method: str, route: str) -> None:
+        with self._lock:
+            self.in_flight[(method, route)] = self.in_flight.get((method, route), 0) + 1
+    
+    def request_finished(self, method: str, route: str, status: int, duration: float, size: int, db_commands: int) -> None:
+        with self._lock:
+            self.in_flight[(method, route)] -= 1
+            key = (method, route, str(status))
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self._histogram(self.latency, (method, route), LATENCY_BUCKETS).observe(duration)
+            self._histogram(self.response_size, (method, route), SIZE_BUCKETS).observe(size)
+            self._histogram(self.db_per_request, route, COUNT_BUCKETS).observe(db_commands)
+    
+    def command_finished(self, route: str, command: str, collection: str, duration: float, ok: bool) -> None:
+        with self._lock:
+            key = (route, command, collection, "ok" if ok else "error")
+            self.db_commands[key] = self.db_commands.get(key, 0) + 1
+            self._histogram(self.db_latency, (command, collection), LATENCY_BUCKETS).observe(duration)
+    
+    def render(self) -> str:
+        lines = []
+        
+        def counter(name: str, help_text: str, kind: str, values: Dict[tuple, int], label_names: tuple):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for key, value in values.items():
+                lines.append(f"{name}{prometheus_labels(dict(zip(label_names, key)))} {value}")
+        
+        def histogram(name: str, help_text: str, values: Dict[Any, Histogram], label_names: tuple):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, h in values.items():
+                labels = dict(zip(label_names, key if isinstance(key, tuple) else (key,)))
+                cumulative = 0
+                for bound, count in zip(h.buckets, h.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{prometheus_labels({**labels, 'le': bound})} {cumulative}")
+                lines.append(f"{name}_bucket{prometheus_labels({**labels, 'le': '+Inf'})} {h.count}")
+                lines.append(f"{name}_sum{prometheus_labels(labels)} {h.sum}")
+                lines.append(f"{name}_count{prometheus_labels(labels)} {h.count}")
+        
+        with self._lock:
+            counter("http_requests_total", "HTTP requests by route and status", "counter",
+                    self.requests, ("method", "route", "status"))
+            counter("http_requests_in_flight", "HTTP requests currently being served", "gauge",
+                    self.in_flight, ("method", "route"))
+            histogram("http_request_duration_seconds", "HTTP request latency", self.latency, ("method", "route"))
+            histogram("http_response_size_bytes", "HTTP response body size", self.response_size, ("method", "route"))
+            histogram("http_request_mongodb_commands", "Mongo commands issued per request", self.db_per_request, ("route",))
+            counter("mongodb_commands_total", "Mongo commands by originating route", "counter",
+                    self.db_commands, ("route", "command", "collection", "outcome"))
+            histogram("mongodb_command_duration_seconds", "Mongo command latency", self.db_latency, ("command", "collection"))
+        
+        return "\n".join(lines) + "\n"
+
+metrics = Metrics()
+
+def command_collection(command_name: str, command: dict) -> str:
+    target = command.get(command_name)
+    if isinstance(target, str):
+        return target
+    # getMore carries the cursor id under its own name
+    return command.get("collection", "")
+
+def redact_shape(value: Any) -> Any:
+    """Keep field names and operators of a filter, drop every value"""
+    if isinstance(value, dict):
+        return {k: redact_shape(v) for k, v in value.items()}
+    if isinstance(value, list):
+        # Keep each branch of $or/$and and pipeline stage; collapse value lists
+        if any(isinstance(v, dict) for v in value):
+            return [redact_shape(v) for v in value]
+        return ["?"] if value else []
+    return "?"
+
+def command_filter(command_name: str, command: dict) -> Any:
+    if command_name == "aggregate":
+        return command.get("pipeline")
+    if command_name in ("update", "delete"):
+        statements = command.get("updates" if command_name == "update" else "deletes") or [{}]
+        return statements[0].get("q")
+    if command_name == "find":
+        return command.get("filter")
+    return command.get("query")
+
+# Commands explain() accepts, minus the driver's session/cluster fields
+EXPLAINABLE_COMMANDS = {"find", "aggregate", "count", "distinct", "findAndModify", "update", "delete"}
+EXPLAIN_DROP_FIELDS = {"lsid", "txnNumber", "autocommit", "startTransaction", "readConcern", "writeConcern"}
+
+def plan_summary(explain: Any, summary: Optional[dict] = None) -> dict:
+    """Walk an explain() result for COLLSCAN stages and the indexes used"""
+    if summary is None:
+        summary = {"collscan": False, "indexes": []}
+    if isinstance(explain, dict):
+        if explain.get("stage") == "COLLSCAN":
+            summary["collscan"] = True
+        if explain.get("indexName") and explain["indexName"] not in summary["indexes"]:
+            summary["indexes"].append(explain["indexName"])
+        for key, v in explain.items():
+            # Rejected plans would flag scans the server didn't run
+            if key != "rejectedPlans":
+                plan_summary(v, summary)
+    elif isinstance(explain, list):
+        for v in explain:
+            plan_summary(v, summary)
+    return summary
+
+class SlowQueryLog:
+    """Ring buffer of Mongo commands slower than SLOW_QUERY_MS.
+    
+    Entries carry the route, collection and a redacted filter shape, never
+    values, since queries touch health records. A sample of explainable
+    commands is re-run through explain() on the event loop and annotated
+    with whether the winning plan scanned the whole collection.
+    """
+    
+    def __init__(self, threshold_ms: float, size: int, explain_rate: float):
+        self.threshold_ms = threshold_ms
+        self.explain_rate = explain_rate
+        self.entries = deque(maxlen=size)
+        self.total = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._explaining = 0
+    
+    def attach(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Enable explain sampling on the loop that owns the Motor client"""
+        self._loop = loop
+    
+    def record(self, route: str, command_name: str, collection: str, command: dict, duration_ms: float) -> None:
+        shape = redact_shape(command_filter(command_name, command))
+        entry = {
+            "at": datetime.utcnow(),
+            "route": route,
+            "command": command_name,
+            "collection": collection,
+            "duration_ms": round(duration_ms, 1),
+            "filter": shape,
+            "sort": command.get("sort"),  # field names and directions only
+            "plan": None
+        }
+        self.entries.append(entry)
+        self.total += 1
+        logger.warning(
+            f"Slow query {duration_ms:.0f}ms: {command_name} {collection} "
+            f"route={route} filter={json.dumps(shape)}"
+        )
+        
+        if (self._loop and command_name in EXPLAINABLE_COMMANDS and self._explaining < 2
+                and random.random() < self.explain_rate):
+            self._explaining += 1
+            asyncio.run_coroutine_threadsafe(self._explain(entry, command), self._loop)
+    
+    async def _explain(self, entry: dict, command: dict) -> None:
+        try:
+            inner = {k: v for k, v in command.items() if not k.startswith("$") and k not in EXPLAIN_DROP_FIELDS}
+            result = await client[command["$db"]].command({"explain": inner, "verbosity": "queryPlanner"})
+            entry["plan"] = plan_summary(result.get("queryPlanner", result))
+            if entry["plan"]["collscan"]:
+                logger.warning(f"Slow query on {entry['collection']} from {entry['route']} is a COLLSCAN")
+        except PyMongoError as e:
+            entry["plan"] = {"error": str(e)}
+        finally:
+            self._explaining -= 1
+    
+    def recent(self, limit: int, collscan_only: bool = False) -> List[dict]:
+        entries = [e for e in reversed(self.entries) if not collscan_only or (e["plan"] or {}).get("collscan")]
+        return entries[:limit]
+
+slow_query_log = SlowQueryLog(SLOW_QUERY_MS, SLOW_QUERY_LOG_SIZE, SLOW_QUERY_EXPLAIN_RATE)
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Attribute every Mongo command and its duration to the active request,
+    and feed commands over the threshold to the slow query log"""
+    
+    def __init__(self):
+        # (connection, request id) -> (request context, command name, collection, command)
+        self._started: Dict[tuple, tuple] = {}
+    
+    def started(self, event) -> None:
+        self._started[(event.connection_id, event.request_id)] = (
+            request_context.get(),
+            event.command_name,
+            command_collection(event.command_name, event.command),
+            event.command
+        )
+    
+    def _finished(self, event, ok: bool) -> None:
+        started = self._started.pop((event.connection_id, event.request_id), None)
+        if started is None:
+            return
+        context, command_name, collection, command = started
+        if context is not None:
+            context["db_commands"] += 1
+        route = context["route"] if context else "<background>"
+        metrics.command_finished(route, command_name, collection, event.duration_micros / 1e6, ok)
+        
+        duration_ms = event.duration_micros / 1000
+        # Our own explain() re-runs are not part of the workload
+        if duration_ms >= slow_query_log.threshold_ms and command_name != "explain":
+            slow_query_log.record(route, command_name, collection, command, duration_ms)
+    
+    def succeeded(self, event) -> None:
+        self._finished(event, True)
+    
+    def failed(self, event) -> None:
+        self._finished(event, False)
+
+class MetricsMiddleware:
+    """Record latency, response size, in-flight count and Mongo commands per route"""
+    
+    def __init__(self, app, router):
+        self.app = app
+        self.router = router
+    
+    def route_template(self, scope) -> str:
+        # Label by path template, not the concrete path, to bound cardinality
+        for route in self.router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+        return "<unmatched>"
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        method = scope["method"]
+        route = self.route_template(scope)
+        context = {"route": route, "db_commands": 0}
+        token = request_context.set(context)
+        status = 500
+        size = 0
+        
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+        
+        metrics.request_started(method, route)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.request_finished(method, route, status, time.perf_counter() - start, size, context["db_commands"])
+            request_context.reset(token)
+
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(mongo_url, event_listeners=[CommandMetricsListener()])
 db = client[os.environ.get('DB_NAME', 'adelphi_db')]
 
 # JWT Configuration
@@ -29,11 +369,101 @@ SECRET_KEY = os.environ.get('JWT_SECRET', 'adelphi-secret-key-change-in-producti
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_DAYS = 30
 
+# Time-series log pagination
+LOG_PAGE_MAX_LIMIT = 500
+
+# Offline batch sync: entries per request, and how far ahead of server time
+# a client timestamp may be before it is rejected as clock skew
+SYNC_BATCH_MAX_ENTRIES = 500
+SYNC_MAX_CLOCK_SKEW = timedelta(minutes=5)
+
+# Delta sync: documents per collection per response, how long deletions are
+# remembered, and how recent a write must be before it is handed out (so a
+# write with an earlier updated_at can't commit behind a client's watermark)
+SYNC_CHANGES_LIMIT = 500
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.environ.get('SYNC_TOMBSTONE_RETENTION_DAYS', '90'))
+SYNC_SETTLE_SECONDS = 2
+
+# Health history export: documents fetched per cursor round-trip and
+# records written per streamed chunk
+EXPORT_BATCH_SIZE = 200
+EXPORT_CHUNK_RECORDS = 100
+
+# Index bootstrap runs on startup unless disabled (e.g. for read-only replicas)
+ENSURE_INDEXES_ON_STARTUP = os.environ.get('ENSURE_INDEXES_ON_STARTUP', 'true').lower() == 'true'
+
+# One-time backfills for derived data are queued on first startup
+RUN_STARTUP_BACKFILLS = os.environ.get('RUN_STARTUP_BACKFILLS', 'true').lower() == 'true'
+
+# Authenticated-user cache (per process)
+USER_CACHE_TTL_SECONDS = float(os.environ.get('USER_CACHE_TTL_SECONDS', '60'))
+USER_CACHE_MAX_SIZE = int(os.environ.get('USER_CACHE_MAX_SIZE', '10000'))
+
+# Per-user /dashboard payload cache, dropped whenever the user writes a log
+DASHBOARD_CACHE_TTL_SECONDS = float(os.environ.get('DASHBOARD_CACHE_TTL_SECONDS', '30'))
+DASHBOARD_CACHE_MAX_SIZE = int(os.environ.get('DASHBOARD_CACHE_MAX_SIZE', '10000'))
+
+# Static catalogs (symptoms, articles, events, specialists) held in memory;
+# the TTL bounds staleness when another process changes a catalog
+CATALOG_CACHE_TTL_SECONDS = float(os.environ.get('CATALOG_CACHE_TTL_SECONDS', '300'))
+
+# Server-sent event streams: connection caps, heartbeat interval, and how
+# many undelivered events a slow subscriber may hold before the oldest drop
+SSE_MAX_CONNECTIONS = int(os.environ.get('SSE_MAX_CONNECTIONS', '1000'))
+SSE_MAX_CONNECTIONS_PER_USER = int(os.environ.get('SSE_MAX_CONNECTIONS_PER_USER', '3'))
+SSE_HEARTBEAT_SECONDS = float(os.environ.get('SSE_HEARTBEAT_SECONDS', '15'))
+SSE_QUEUE_SIZE = 100
+
+# Reaction taps are buffered in memory and written (and broadcast to group
+# streams) in one bulk_write per interval, or sooner once this many pile up
+REACTION_FLUSH_INTERVAL_MS = int(os.environ.get('REACTION_FLUSH_INTERVAL_MS', '250'))
+REACTION_FLUSH_MAX_EVENTS = int(os.environ.get('REACTION_FLUSH_MAX_EVENTS', '500'))
+REACTION_MAX_RETRIES = int(os.environ.get('REACTION_MAX_RETRIES', '5'))
+REACTION_DRAIN_SECONDS = float(os.environ.get('REACTION_DRAIN_SECONDS', '5'))
+
+# Reminder scheduler: run it in this process, how often to rebuild its index
+# from Mongo (picks up changes made through other workers), and how far back
+# to fire missed slots after a restart or stall
+RUN_REMINDER_SCHEDULER = os.environ.get('RUN_REMINDER_SCHEDULER', 'true').lower() == 'true'
+REMINDER_RESYNC_SECONDS = float(os.environ.get('REMINDER_RESYNC_SECONDS', '600'))
+REMINDER_CATCHUP_MINUTES = int(os.environ.get('REMINDER_CATCHUP_MINUTES', '5'))
+NOTIFICATION_QUEUE_SIZE = int(os.environ.get('NOTIFICATION_QUEUE_SIZE', '10000'))
+
+# Push delivery through the Expo push service; PUSH_API_URL can point at a
+# local fake server for load testing
+PUSH_API_URL = os.environ.get('PUSH_API_URL', 'https://exp.host/--/api/v2/push/send')
+EXPO_ACCESS_TOKEN = os.environ.get('EXPO_ACCESS_TOKEN')
+PUSH_CONCURRENCY = int(os.environ.get('PUSH_CONCURRENCY', '4'))
+PUSH_MAX_RETRIES = int(os.environ.get('PUSH_MAX_RETRIES', '3'))
+PUSH_RETRY_BASE_SECONDS = float(os.environ.get('PUSH_RETRY_BASE_SECONDS', '0.5'))
+
+# Mongo-backed job queue: in-process workers (0 leaves jobs to worker.py),
+# how long a claimed job stays invisible to other workers, and retry policy
+JOB_WORKER_CONCURRENCY = int(os.environ.get('JOB_WORKER_CONCURRENCY', '1'))
+JOB_VISIBILITY_TIMEOUT_SECONDS = int(os.environ.get('JOB_VISIBILITY_TIMEOUT_SECONDS', '300'))
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', '5'))
+JOB_RETRY_BASE_SECONDS = float(os.environ.get('JOB_RETRY_BASE_SECONDS', '10'))
+JOB_POLL_SECONDS = float(os.environ.get('JOB_POLL_SECONDS', '2'))
+JOB_RETENTION_DAYS = int(os.environ.get('JOB_RETENTION_DAYS', '7'))
+
 # Google OAuth Configuration
 GOOGLE_CLIENT_ID = os.environ.get('GOOGLE_CLIENT_ID', '')
+GOOGLE_CERTS_URL = os.environ.get('GOOGLE_CERTS_URL', 'https://www.googleapis.com/oauth2/v3/certs')
+GOOGLE_ISSUERS = ["accounts.google.com", "https://accounts.google.com"]
+
+# Shared pooled client for all outbound HTTP calls
+http_client = httpx.AsyncClient(
+    timeout=httpx.Timeout(10.0),
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+)
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# bcrypt runs on a dedicated thread pool so it never blocks the event loop.
+# Requests beyond the queue cap are turned away rather than piling up.
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', '4'))
+PASSWORD_HASH_MAX_QUEUE = int(os.environ.get('PASSWORD_HASH_MAX_QUEUE', '200'))
 security = HTTPBearer()
 
 # Create the main app
@@ -96,6 +526,15 @@ class ExerciseIntensity(str, Enum):
     MODERATE = "moderate"
     INTENSE = "intense"
 
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+class SyncLogType(str, Enum):
+    SYMPTOM = "symptom"
+    MOOD = "mood"
+    LIFESTYLE = "lifestyle"
+
 # ==================== MODELS ====================
 
 # User Models
@@ -243,6 +682,7 @@ class ReminderCreate(BaseModel):
     days: List[str] = []  # mon, tue, wed, etc. or empty for daily
     enabled: bool = True
     custom_message: Optional[str] = None
+    timezone: Optional[str] = None  # IANA name, e.g. Europe/London; UTC if unset
 
 class ReminderResponse(BaseModel):
     id: str
@@ -253,12 +693,14 @@ class ReminderResponse(BaseModel):
     days: List[str]
     enabled: bool
     custom_message: Optional[str] = None
+    timezone: Optional[str] = None
 
 class ReminderUpdate(BaseModel):
     enabled: Optional[bool] = None
     time: Optional[str] = None
     days: Optional[List[str]] = None
     custom_message: Optional[str] = None
+    timezone: Optional[str] = None
 
 # Article Models
 class ArticleCreate(BaseModel):
@@ -422,14 +864,304 @@ class PushTokenCreate(BaseModel):
     token: str
     device_type: str  # ios, android
 
+# Offline Batch Sync Models
+class SyncBatchEntry(BaseModel):
+    type: SyncLogType
+    idempotency_key: str = Field(min_length=1, max_length=128)
+    logged_at: Optional[datetime] = None  # When the device captured it
+    data: Dict[str, Any]  # Body of the matching POST /*-logs request
+
+class SyncBatchRequest(BaseModel):
+    entries: List[SyncBatchEntry] = Field(max_length=SYNC_BATCH_MAX_ENTRIES)
+
+class SyncBatchItemResult(BaseModel):
+    idempotency_key: str
+    status: str  # created, duplicate, invalid, failed
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+class SyncBatchResponse(BaseModel):
+    results: List[SyncBatchItemResult]
+
+# ==================== CACHES ====================
+
+class TTLCache:
+    """Bounded in-process LRU cache whose entries expire after a fixed TTL"""
+    
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Any, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Any) -> Any:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+    
+    def set(self, key: Any, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def invalidate(self, key: Any) -> None:
+        self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None
+        }
+
+# Users resolved by get_current_user, keyed by user id string. Routes that
+# change a user document must invalidate its entry.
+user_cache = TTLCache(USER_CACHE_MAX_SIZE, USER_CACHE_TTL_SECONDS)
+
+# Dashboard payloads keyed by user id, stored with the UTC day they describe
+dashboard_cache = TTLCache(DASHBOARD_CACHE_MAX_SIZE, DASHBOARD_CACHE_TTL_SECONDS)
+
+# Documents each catalog holds; anything outside the filter is never served
+CATALOG_QUERIES = {
+    "symptoms": {"reviewed": True},
+    "articles": {},
+    "events": {},
+    "specialists": {},
+}
+
+class CatalogCache:
+    """Versioned whole-collection copies of the rarely changing catalogs.
+    
+    Each catalog is loaded once and filtered in memory. Its version changes
+    whenever it is invalidated or reloaded, and feeds the ETags of the views
+    built from it.
+    """
+    
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, dict] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.hits = 0
+        self.loads = 0
+    
+    async def get(self, name: str) -> dict:
+        entry = self._entries.get(name)
+        if entry and entry["expires_at"] > time.monotonic():
+            self.hits += 1
+            return entry
+        
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            # Another request may have loaded it while we waited
+            entry = self._entries.get(name)
+            if entry and entry["expires_at"] > time.monotonic():
+                self.hits += 1
+                return entry
+            
+            docs = await db[name].find(CATALOG_QUERIES[name]).to_list(None)
+            entry = {
+                "docs": docs,
+                "by_id": {str(d["_id"]): d for d in docs},
+                "version": hashlib.sha1(json_util.dumps(docs, sort_keys=True).encode()).hexdigest(),
+                "expires_at": time.monotonic() + self.ttl_seconds
+            }
+            self._entries[name] = entry
+            self.loads += 1
+            return entry
+    
+    def invalidate(self, name: Optional[str] = None) -> None:
+        if name is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(name, None)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "catalogs": {name: len(e["docs"]) for name, e in self._entries.items()},
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "loads": self.loads
+        }
+
+catalog_cache = CatalogCache(CATALOG_CACHE_TTL_SECONDS)
+
+# ==================== REALTIME ====================
+
+class PubSub:
+    """In-process publish/subscribe hub for server-sent event streams.
+    
+    Events only reach subscribers connected to this process. To fan out
+    across workers, swap in a broker-backed class (e.g. Redis pub/sub)
+    with the same subscribe/unsubscribe/publish methods.
+    """
+    
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._channels: Dict[str, Set[asyncio.Queue]] = {}
+        self.published = 0
+        self.dropped = 0
+    
+    def subscribe(self, channel: str) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._channels.setdefault(channel, set()).add(queue)
+        return queue
+    
+    def unsubscribe(self, channel: str, queue: asyncio.Queue) -> None:
+        subscribers = self._channels.get(channel)
+        if subscribers:
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._channels[channel]
+    
+    async def publish(self, channel: str, event: str, data: dict) -> int:
+        subscribers = self._channels.get(channel, ())
+        for queue in subscribers:
+            if queue.full():
+                # Slow consumer - newest state matters more than history
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait((event, data))
+        self.published += 1
+        return len(subscribers)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "channels": len(self._channels),
+            "subscribers": sum(len(s) for s in self._channels.values()),
+            "published": self.published,
+            "dropped": self.dropped
+        }
+
+pubsub = PubSub(SSE_QUEUE_SIZE)
+
+# Open event streams, in total and per user
+sse_connections: Dict[str, int] = {}
+
+def check_sse_capacity(user_id: str) -> None:
+    if sum(sse_connections.values()) >= SSE_MAX_CONNECTIONS:
+        raise HTTPException(status_code=503, detail="Too many open event streams")
+    if sse_connections.get(user_id, 0) >= SSE_MAX_CONNECTIONS_PER_USER:
+        raise HTTPException(status_code=429, detail="Too many open event streams for this user")
+
+def reserve_sse_connection(user_id: str) -> None:
+    sse_connections[user_id] = sse_connections.get(user_id, 0) + 1
+
+def release_sse_connection(user_id: str) -> None:
+    sse_connections[user_id] -= 1
+    if sse_connections[user_id] <= 0:
+        del sse_connections[user_id]
+
+async def sse_stream(request: Request, channel: str, user_id: str):
+    """Relay a subscription as text/event-stream, with heartbeats"""
+    # Reserved here rather than in the handler: if the client goes away
+    # before the body starts, the generator never runs and holds nothing
+    reserve_sse_connection(user_id)
+    queue = pubsub.subscribe(channel)
+    try:
+        yield "retry: 5000\n\n"
+        while not await request.is_disconnected():
+            try:
+                event, data = await asyncio.wait_for(queue.get(), timeout=SSE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                # Keeps proxies from closing an idle stream and lets us notice disconnects
+                yield ": ping\n\n"
+                continue
+            yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+    finally:
+        pubsub.unsubscribe(channel, queue)
+        release_sse_connection(user_id)
+
+def event_stream_response(request: Request, channel: str, user_id: str) -> StreamingResponse:
+    # Fail fast with 503/429; the slot itself is taken once streaming starts
+    check_sse_capacity(user_id)
+    return StreamingResponse(
+        sse_stream(request, channel, user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # ==================== HELPER FUNCTIONS ====================
 
+class PasswordHashPool:
+    """Bounded thread pool for bcrypt work, with queue-depth metrics"""
+    
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self.pending = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+    
+    @property
+    def queued(self) -> int:
+        return max(0, self.pending - self.max_workers)
+    
+    async def run(self, fn, *args):
+        if self.queued >= self.max_queue:
+            self.rejected += 1
+            raise HTTPException(status_code=503, detail="Server busy, please try again")
+        
+        self.pending += 1
+        self.peak_pending = max(self.peak_pending, self.pending)
+        started = time.monotonic()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+            self.total_seconds += time.monotonic() - started
+    
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "active": min(self.pending, self.max_workers),
+            "queued": self.queued,
+            "peak_pending": self.peak_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_seconds": round(self.total_seconds / self.completed, 4) if self.completed else None
+        }
+
+password_pool = PasswordHashPool(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_QUEUE)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+async def hash_password_async(password: str) -> str:
+    return await password_pool.run(hash_password, password)
+
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=ACCESS_TOKEN_EXPIRE_DAYS)
@@ -444,19 +1176,496 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         if not user_id:
             raise HTTPException(status_code=401, detail="Invalid token")
         
-        user = await db.users.find_one({"_id": ObjectId(user_id)})
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
+        user = user_cache.get(user_id)
+        if user is None:
+            user = await db.users.find_one({"_id": ObjectId(user_id)})
+            if not user:
+                raise HTTPException(status_code=401, detail="User not found")
+            user_cache.set(user_id, user)
         
-        return user
+        # Hand out a copy so a route can't mutate the cached document
+        return dict(user)
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+class GoogleKeyCache:
+    """Google's ID token signing keys, cached for their Cache-Control max-age.
+    
+    A background task refreshes the keys shortly before they expire so
+    sign-ins never wait on the fetch; an unknown key id triggers an
+    immediate (rate-limited) refresh to pick up rotations.
+    """
+    
+    DEFAULT_MAX_AGE = 3600
+    MIN_REFRESH_INTERVAL = 60
+    
+    def __init__(self, url: str):
+        self.url = url
+        self._keys: Dict[str, Any] = {}
+        self._expires_at = 0.0
+        self._last_fetch = 0.0
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+    
+    def _needs_refresh(self, kid: Optional[str]) -> bool:
+        now = time.monotonic()
+        if now >= self._expires_at:
+            return True
+        return kid is not None and kid not in self._keys and now - self._last_fetch >= self.MIN_REFRESH_INTERVAL
+    
+    async def refresh(self, kid: Optional[str] = None, force: bool = False) -> None:
+        async with self._lock:
+            # Callers that queued behind another fetch find the keys fresh
+            if not force and not self._needs_refresh(kid):
+                return
+            self._last_fetch = time.monotonic()
+            response = await http_client.get(self.url)
+            response.raise_for_status()
+            
+            keys = {}
+            for jwk in response.json().get("keys", []):
+                try:
+                    keys[jwk["kid"]] = jwt.PyJWK(jwk).key
+                except (KeyError, jwt.PyJWKError) as e:
+                    logger.warning(f"Skipping unusable Google signing key: {e}")
+            
+            max_age = self.DEFAULT_MAX_AGE
+            match = re.search(r"max-age=(\d+)", response.headers.get("cache-control", ""))
+            if match:
+                max_age = int(match.group(1))
+            
+            self._keys = keys
+            self._expires_at = time.monotonic() + max_age
+    
+    async def get_key(self, kid: Optional[str]) -> Any:
+        if self._needs_refresh(kid):
+            await self.refresh(kid)
+        return self._keys.get(kid)
+    
+    async def _refresh_loop(self) -> None:
+        while True:
+            # Refresh at 90% of the advertised lifetime
+            delay = max(self.MIN_REFRESH_INTERVAL, (self._expires_at - time.monotonic()) * 0.9)
+            await asyncio.sleep(delay)
+            try:
+                await self.refresh(force=True)
+            except (httpx.HTTPError, ValueError) as e:
+                logger.error(f"Google signing key refresh failed: {e}")
+    
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop())
+    
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+google_keys = GoogleKeyCache(GOOGLE_CERTS_URL)
+
+async def verify_google_id_token(id_token: str) -> dict:
+    """Verify a Google ID token's signature, expiry and issuer locally"""
+    header = jwt.get_unverified_header(id_token)
+    key = await google_keys.get_key(header.get("kid"))
+    if key is None:
+        raise jwt.InvalidTokenError("Unknown signing key")
+    
+    # Audience is checked by the caller, which tolerates web client IDs
+    return jwt.decode(
+        id_token,
+        key,
+        algorithms=["RS256"],
+        issuer=GOOGLE_ISSUERS,
+        options={"verify_aud": False}
+    )
+
 def generate_invite_code() -> str:
     return str(uuid.uuid4())[:8].upper()
 
+def encode_log_cursor(log: dict) -> str:
+    raw = json.dumps({"t": log["logged_at"].isoformat(), "id": str(log["_id"])})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_log_cursor(cursor: str) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["t"]), ObjectId(data["id"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+async def fetch_log_page(collection, user_id: str, since: datetime, cursor: Optional[str], limit: int, response: Response) -> List[dict]:
+    """Newest-first keyset page over (logged_at, _id) of one user's logs.
+    
+    Sets X-Next-Cursor on the response when more logs remain.
+    """
+    query = {"user_id": user_id, "logged_at": {"$gte": since}}
+    if cursor:
+        logged_at, log_id = decode_log_cursor(cursor)
+        query["$or"] = [
+            {"logged_at": {"$lt": logged_at}},
+            {"logged_at": logged_at, "_id": {"$lt": log_id}}
+        ]
+    
+    # Fetch one extra document to learn whether another page exists
+    logs = await collection.find(query).sort([("logged_at", -1), ("_id", -1)]).limit(limit + 1).to_list(limit + 1)
+    if len(logs) > limit:
+        logs = logs[:limit]
+        response.headers["X-Next-Cursor"] = encode_log_cursor(logs[-1])
+    
+    return logs
+
+# ==================== CONDITIONAL REQUESTS ====================
+
+# Routes that know their data version cheaply call conditional_response()
+# before building any response models. ConditionalGetMiddleware covers every
+# other JSON GET by hashing the serialized body, which still saves the
+# transfer even though the body has been built.
+
+def doc_version(doc: dict) -> datetime:
+    return doc.get("updated_at") or doc.get("created_at") or doc["_id"].generation_time.replace(tzinfo=None)
+
+def view_etag(version: str, docs: List[dict]) -> str:
+    """Strong ETag for a list of documents taken from a versioned source"""
+    ids = ",".join(str(d["_id"]) for d in docs)
+    return '"' + hashlib.sha1(f"{version}:{ids}".encode()).hexdigest() + '"'
+
+def docs_etag(docs: List[dict]) -> str:
+    """Strong ETag from the ids and modification times of the documents"""
+    parts = ",".join(f"{d['_id']}@{doc_version(d).isoformat()}" for d in docs)
+    return '"' + hashlib.sha1(parts.encode()).hexdigest() + '"'
+
+def http_date(value: datetime) -> str:
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+def is_not_modified(request_headers: Headers, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2)
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match:
+        candidates = [c.strip() for c in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates
+    
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since).astimezone(timezone.utc).replace(tzinfo=None)
+        except (TypeError, ValueError):
+            return False
+        return last_modified.replace(microsecond=0) <= since
+    
+    return False
+
+def conditional_response(request: Request, response: Response, etag: str, last_modified: Optional[datetime] = None) -> Optional[Response]:
+    """Return a 304 if the client's copy is current, else tag the response"""
+    headers = {"ETag": etag}
+    if last_modified:
+        headers["Last-Modified"] = http_date(last_modified)
+    
+    if is_not_modified(request.headers, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    
+    response.headers.update(headers)
+    return None
+
+class ConditionalGetMiddleware:
+    """Give untagged JSON GET responses a body-hash ETag and honor If-None-Match"""
+    
+    def __init__(self, app, max_body_bytes: int = 1024 * 1024):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+        
+        request_headers = Headers(scope=scope)
+        start_message = None
+        chunks = []
+        size = 0
+        passthrough = False
+        
+        async def send_wrapper(message):
+            nonlocal start_message, size, passthrough
+            if passthrough:
+                await send(message)
+                return
+            
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if (message["status"] != 200 or "etag" in headers
+                        or not headers.get("content-type", "").startswith("application/json")):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+            
+            chunks.append(message.get("body", b""))
+            size += len(chunks[-1])
+            if message.get("more_body", False):
+                if size > self.max_body_bytes:
+                    # Too large to buffer - send what we have untagged
+                    passthrough = True
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": b"".join(chunks), "more_body": True})
+                return
+            
+            body = b"".join(chunks)
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            if is_not_modified(request_headers, etag):
+                await send({
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": [(b"etag", etag.encode())]
+                })
+                await send({"type": "http.response.body", "body": b""})
+                return
+            
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers["ETag"] = etag
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+    
+        await self.app(scope, receive, send_wrapper)
+
+# ==================== DATABASE INDEXES ====================
+
+# One entry per query shape used by the routes below. Names are fixed so the
+# startup reconciler can detect when a declared spec drifts from what exists.
+INDEX_SPECS: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ],
+    "profiles": [
+        IndexModel([("user_id", ASCENDING)], name="user_id"),
+        IndexModel([("user_id", ASCENDING), ("updated_at", ASCENDING), ("_id", ASCENDING)], name="user_updated_at"),
+    ],
+    "symptom_logs": [
+        IndexModel([("user_id", ASCENDING), ("logged_at", DESCENDING), ("_id", DESCENDING)], name="user_logged_at_id"),
+        IndexModel(
+            [("user_id", ASCENDING), ("idempotency_key", ASCENDING)],
+            name="user_idempotency_key_unique",
+            unique=True,
+            partialFilterExpression={"idempotency_key": {"$type": "string"}}
+        ),
+        IndexModel([("user_id", ASCENDING), ("updated_at", ASCENDING), ("_id", ASCENDING)], name="user_updated_at"),
+    ],
+    "mood_logs": [
+        IndexModel([("user_id", ASCENDING), ("logged_at", DESCENDING), ("_id", DESCENDING)], name="user_logged_at_id"),
+        IndexModel(
+            [("user_id", ASCENDING), ("idempotency_key", ASCENDING)],
+            name="user_idempotency_key_unique",
+            unique=True,
+            partialFilterExpression={"idempotency_key": {"$type": "string"}}
+        ),
+        IndexModel([("user_id", ASCENDING), ("updated_at", ASCENDING), ("_id", ASCENDING)], name="user_updated_at"),
+    ],
+    "lifestyle_logs": [
+        IndexModel([("user_id", ASCENDING), ("logged_at", DESCENDING), ("_id", DESCENDING)], name="user_logged_at_id"),
+        IndexModel(
+            [("user_id", ASCENDING), ("idempotency_key", ASCENDING)],
+            name="user_idempotency_key_unique",
+            unique=True,
+            partialFilterExpression={"idempotency_key": {"$type": "string"}}
+        ),
+        IndexModel([("user_id", ASCENDING), ("updated_at", ASCENDING), ("_id", ASCENDING)], name="user_updated_at"),
+    ],
+    "reminders": [
+        IndexModel([("user_id", ASCENDING)], name="user_id"),
+        IndexModel([("user_id", ASCENDING), ("updated_at", ASCENDING), ("_id", ASCENDING)], name="user_updated_at"),
+    ],
+    "tombstones": [
+        IndexModel([("user_id", ASCENDING), ("updated_at", ASCENDING), ("_id", ASCENDING)], name="user_updated_at"),
+        IndexModel([("deleted_at", ASCENDING)], name="deleted_at_ttl", expireAfterSeconds=SYNC_TOMBSTONE_RETENTION_DAYS * 86400),
+    ],
+    "bookmarks": [
+        IndexModel([("user_id", ASCENDING), ("article_id", ASCENDING)], name="user_article_unique", unique=True),
+    ],
+    "partner_invites": [
+        IndexModel([("invite_code", ASCENDING)], name="invite_code_unique", unique=True),
+    ],
+    "partner_links": [
+        IndexModel([("primary_user_id", ASCENDING), ("is_active", ASCENDING)], name="primary_active"),
+        IndexModel([("partner_user_id", ASCENDING), ("is_active", ASCENDING)], name="partner_active"),
+    ],
+    "group_members": [
+        IndexModel([("group_id", ASCENDING), ("user_id", ASCENDING)], name="group_user_unique", unique=True),
+        IndexModel([("user_id", ASCENDING)], name="user_id"),
+    ],
+    "posts": [
+        IndexModel([("group_id", ASCENDING), ("created_at", DESCENDING)], name="group_created_at"),
+    ],
+    "comments": [
+        IndexModel([("post_id", ASCENDING), ("created_at", ASCENDING)], name="post_created_at"),
+    ],
+    "articles": [
+        # Relevance-ranked search; Mongo maintains it on every insert
+        IndexModel(
+            [("title", TEXT), ("tags", TEXT), ("content", TEXT)],
+            name="article_search",
+            weights={"title": 10, "tags": 5, "content": 1},
+            default_language="english"
+        ),
+    ],
+    "events": [
+        IndexModel([("start_time", ASCENDING)], name="start_time"),
+    ],
+    "daily_rollups": [
+        IndexModel([("user_id", ASCENDING), ("day", ASCENDING)], name="user_day_unique", unique=True),
+    ],
+    "push_tokens": [
+        IndexModel([("user_id", ASCENDING), ("device_type", ASCENDING)], name="user_device_unique", unique=True),
+    ],
+    "jobs": [
+        IndexModel([("status", ASCENDING), ("run_at", ASCENDING)], name="status_run_at"),
+        IndexModel([("status", ASCENDING), ("locked_until", ASCENDING)], name="status_locked_until"),
+        IndexModel([("finished_at", ASCENDING)], name="finished_at_ttl", expireAfterSeconds=JOB_RETENTION_DAYS * 86400),
+    ],
+}
+
+# Index options that change query semantics; a difference in any of these
+# means the existing index has to be rebuilt.
+INDEX_OPTIONS = ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds")
+
+# MongoDB can't alter an index in place, so a changed spec ships under a new
+# name and the old one is listed here as {old name: replacement name}. Old
+# indexes are only dropped by the drop-retired-indexes maintenance task, and
+# only once their replacement exists.
+RETIRED_INDEXES: Dict[str, Dict[str, str]] = {
+    # Keyset pagination needs _id as a tiebreaker after logged_at
+    "symptom_logs": {"user_logged_at": "user_logged_at_id"},
+    "mood_logs": {"user_logged_at": "user_logged_at_id"},
+    "lifestyle_logs": {"user_logged_at": "user_logged_at_id"},
+}
+
+def _index_matches(existing: dict, spec: dict) -> bool:
+    if TEXT in spec["key"].values():
+        # Text indexes report their fields as weights rather than keys
+        expected_weights = {
+            field: spec.get("weights", {}).get(field, 1)
+            for field, direction in spec["key"].items() if direction == TEXT
+        }
+        if existing.get("weights") != expected_weights:
+            return False
+        if existing.get("default_language", "english") != spec.get("default_language", "english"):
+            return False
+    else:
+        existing_key = [(field, int(direction) if isinstance(direction, (int, float)) else direction)
+                        for field, direction in existing["key"]]
+        if existing_key != list(spec["key"].items()):
+            return False
+    for option in INDEX_OPTIONS:
+        if option in ("unique", "sparse"):
+            if bool(existing.get(option)) != bool(spec.get(option)):
+                return False
+        elif existing.get(option) != spec.get(option):
+            return False
+    return True
+
+async def ensure_indexes() -> Dict[str, Dict[str, List[str]]]:
+    """Create missing indexes and report ones whose spec has drifted.
+    
+    Existing indexes are never dropped here: every process runs this on
+    startup, and a drop-and-rebuild would race between workers and leave
+    the collection unindexed while it builds. Ship changed specs under a
+    new name instead (see RETIRED_INDEXES).
+    """
+    summary = {}
+    for collection_name, models in INDEX_SPECS.items():
+        collection = db[collection_name]
+        existing = await collection.index_information()
+        actions = {"created": [], "drifted": [], "failed": []}
+        
+        for model in models:
+            spec = model.document
+            name = spec["name"]
+            current = existing.get(name)
+            if current:
+                if not _index_matches(current, spec):
+                    logger.warning(f"Index {collection_name}.{name} differs from its declared spec; rename the spec to rebuild it")
+                    actions["drifted"].append(name)
+                continue
+            
+            try:
+                await collection.create_indexes([model])
+                actions["created"].append(name)
+            except OperationFailure as e:
+                # e.g. duplicate data blocking a unique index - keep serving
+                logger.error(f"Failed to build index {collection_name}.{name}: {e}")
+                actions["failed"].append(name)
+        
+        if any(actions.values()):
+            summary[collection_name] = actions
+    
+    if summary:
+        logger.info(f"Index reconciliation: {summary}")
+    return summary
+
+async def drop_retired_indexes() -> Dict[str, Dict[str, List[str]]]:
+    """Drop retired indexes whose replacement has finished building"""
+    summary = {}
+    for collection_name, retired in RETIRED_INDEXES.items():
+        collection = db[collection_name]
+        existing = await collection.index_information()
+        actions = {"dropped": [], "waiting": []}
+        
+        for old_name, replacement in retired.items():
+            if old_name not in existing:
+                continue
+            if replacement not in existing:
+                actions["waiting"].append(old_name)
+                continue
+            await collection.drop_index(old_name)
+            actions["dropped"].append(old_name)
+        
+        if any(actions.values()):
+            summary[collection_name] = actions
+    
+    return summary
+
+async def index_report() -> Dict[str, Dict[str, Any]]:
+    """Report declared indexes that are missing or drifted, retired ones still
+    present, and existing ones that are never used"""
+    report = {}
+    for collection_name, models in INDEX_SPECS.items():
+        collection = db[collection_name]
+        existing = await collection.index_information()
+        declared = {m.document["name"]: m.document for m in models}
+        
+        missing = [name for name in declared if name not in existing]
+        drifted = [
+            name for name, spec in declared.items()
+            if name in existing and not _index_matches(existing[name], spec)
+        ]
+        retired = RETIRED_INDEXES.get(collection_name, {})
+        undeclared = [
+            name for name in existing
+            if name != "_id_" and name not in declared and name not in retired
+        ]
+        
+        unused = []
+        try:
+            async for stats in collection.aggregate([{"$indexStats": {}}]):
+                if stats["name"] != "_id_" and stats["accesses"]["ops"] == 0:
+                    unused.append({"name": stats["name"], "since": stats["accesses"]["since"]})
+        except OperationFailure as e:
+            # $indexStats needs clusterMonitor privileges on some deployments
+            logger.warning(f"Could not read index stats for {collection_name}: {e}")
+            unused = None
+        
+        report[collection_name] = {
+            "missing": missing,
+            "drifted": drifted,
+            "retired": [name for name in retired if name in existing],
+            "undeclared": undeclared,
+            "unused": unused
+        }
+    
+    return report
+
 # ==================== AUTH ROUTES ====================
 
 @api_router.post("/auth/register", response_model=TokenResponse)
@@ -469,7 +1678,7 @@ async def register(user_data: UserCreate):
     # Create user
     user_dict = {
         "email": user_data.email.lower(),
-        "password_hash": hash_password(user_data.password),
+        "password_hash": await hash_password_async(user_data.password),
         "name": user_data.name,
         "role": user_data.role.value,
         "has_completed_onboarding": False,
@@ -484,6 +1693,7 @@ async def register(user_data: UserCreate):
         "user_id": user_id,
         "created_at": datetime.utcnow()
     }
+    profile_dict["updated_at"] = profile_dict["created_at"]
     await db.profiles.insert_one(profile_dict)
     
     # Generate token
@@ -504,7 +1714,7 @@ async def register(user_data: UserCreate):
 @api_router.post("/auth/login", response_model=TokenResponse)
 async def login(credentials: UserLogin):
     user = await db.users.find_one({"email": credentials.email.lower()})
-    if not user or not verify_password(credentials.password, user["password_hash"]):
+    if not user or not await verify_password_async(credentials.password, user["password_hash"]):
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
     user_id = str(user["_id"])
@@ -526,88 +1736,82 @@ async def login(credentials: UserLogin):
 async def google_auth(auth_data: GoogleAuthRequest):
     """Authenticate with Google OAuth token"""
     try:
-        # Verify the Google ID token
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://oauth2.googleapis.com/tokeninfo?id_token={auth_data.id_token}"
-            )
-            
-            if response.status_code != 200:
-                raise HTTPException(status_code=401, detail="Invalid Google token")
-            
-            google_data = response.json()
-            
-            # Verify the token is for our app (if client ID is configured)
-            if GOOGLE_CLIENT_ID and google_data.get("aud") != GOOGLE_CLIENT_ID:
-                # Also accept web client IDs that may differ
-                logger.warning(f"Token audience mismatch: {google_data.get('aud')}")
-            
-            email = google_data.get("email")
-            name = google_data.get("name", email.split("@")[0])
-            
-            if not email:
-                raise HTTPException(status_code=400, detail="Could not get email from Google")
-            
-            # Check if user exists
-            existing_user = await db.users.find_one({"email": email.lower()})
-            
-            if existing_user:
-                # User exists, log them in
-                user_id = str(existing_user["_id"])
-                token = create_access_token({"user_id": user_id})
-                
-                return TokenResponse(
-                    access_token=token,
-                    user=UserResponse(
-                        id=user_id,
-                        email=existing_user["email"],
-                        name=existing_user["name"],
-                        role=UserRole(existing_user["role"]),
-                        has_completed_onboarding=existing_user.get("has_completed_onboarding", False),
-                        created_at=existing_user["created_at"]
-                    )
-                )
-            else:
-                # Create new user
-                user_dict = {
-                    "email": email.lower(),
-                    "password_hash": None,  # No password for Google users
-                    "name": name,
-                    "role": auth_data.role.value,
-                    "has_completed_onboarding": False,
-                    "google_id": google_data.get("sub"),
-                    "auth_provider": "google",
-                    "created_at": datetime.utcnow()
-                }
-                
-                result = await db.users.insert_one(user_dict)
-                user_id = str(result.inserted_id)
-                
-                # Create profile
-                profile_dict = {
-                    "user_id": user_id,
-                    "created_at": datetime.utcnow()
-                }
-                await db.profiles.insert_one(profile_dict)
-                
-                # Generate token
-                token = create_access_token({"user_id": user_id})
-                
-                return TokenResponse(
-                    access_token=token,
-                    user=UserResponse(
-                        id=user_id,
-                        email=user_dict["email"],
-                        name=user_dict["name"],
-                        role=auth_data.role,
-                        has_completed_onboarding=False,
-                        created_at=user_dict["created_at"]
-                    )
-                )
-                
-    except httpx.RequestError as e:
-        logger.error(f"Google auth request error: {e}")
+        # Verify the Google ID token against Google's cached public keys
+        google_data = await verify_google_id_token(auth_data.id_token)
+    except jwt.InvalidTokenError:
+        raise HTTPException(status_code=401, detail="Invalid Google token")
+    except (httpx.HTTPError, ValueError) as e:
+        logger.error(f"Google signing key fetch error: {e}")
         raise HTTPException(status_code=500, detail="Failed to verify Google token")
+    
+    # Verify the token is for our app (if client ID is configured)
+    if GOOGLE_CLIENT_ID and google_data.get("aud") != GOOGLE_CLIENT_ID:
+        # Also accept web client IDs that may differ
+        logger.warning(f"Token audience mismatch: {google_data.get('aud')}")
+    
+    email = google_data.get("email")
+    if not email:
+        raise HTTPException(status_code=400, detail="Could not get email from Google")
+    
+    name = google_data.get("name", email.split("@")[0])
+    
+    # Check if user exists
+    existing_user = await db.users.find_one({"email": email.lower()})
+    
+    if existing_user:
+        # User exists, log them in
+        user_id = str(existing_user["_id"])
+        token = create_access_token({"user_id": user_id})
+        
+        return TokenResponse(
+            access_token=token,
+            user=UserResponse(
+                id=user_id,
+                email=existing_user["email"],
+                name=existing_user["name"],
+                role=UserRole(existing_user["role"]),
+                has_completed_onboarding=existing_user.get("has_completed_onboarding", False),
+                created_at=existing_user["created_at"]
+            )
+        )
+    
+    # Create new user
+    user_dict = {
+        "email": email.lower(),
+        "password_hash": None,  # No password for Google users
+        "name": name,
+        "role": auth_data.role.value,
+        "has_completed_onboarding": False,
+        "google_id": google_data.get("sub"),
+        "auth_provider": "google",
+        "created_at": datetime.utcnow()
+    }
+    
+    result = await db.users.insert_one(user_dict)
+    user_id = str(result.inserted_id)
+    
+    # Create profile
+    profile_dict = {
+        "user_id": user_id,
+        "created_at": datetime.utcnow()
+    }
+    profile_dict["updated_at"] = profile_dict["created_at"]
+    await db.profiles.insert_one(profile_dict)
+    
+    # Generate token
+    token = create_access_token({"user_id": user_id})
+    
+    return TokenResponse(
+        access_token=token,
+        user=UserResponse(
+            id=user_id,
+            email=user_dict["email"],
+            name=user_dict["name"],
+            role=auth_data.role,
+            has_completed_onboarding=False,
+            created_at=user_dict["created_at"]
+        )
+    )
 
 @api_router.get("/auth/me", response_model=UserResponse)
 async def get_me(user: dict = Depends(get_current_user)):
@@ -649,6 +1853,7 @@ async def complete_onboarding(data: OnboardingData, user: dict = Depends(get_cur
         {"_id": ObjectId(user_id)},
         {"$set": {"has_completed_onboarding": True}}
     )
+    user_cache.invalidate(user_id)
     
     return {"success": True, "message": "Onboarding completed"}
 
@@ -679,6 +1884,7 @@ async def update_profile(data: UserProfileUpdate, user: dict = Depends(get_curre
             {"_id": ObjectId(user_id)},
             {"$set": {"name": data.name}}
         )
+        user_cache.invalidate(user_id)
     
     await db.profiles.update_one(
         {"user_id": user_id},
@@ -688,20 +1894,134 @@ async def update_profile(data: UserProfileUpdate, user: dict = Depends(get_curre
     
     return {"success": True}
 
+# ==================== DAILY ROLLUPS ====================
+
+# One document per user per UTC day, incremented on every log write so
+# insights and trend charts read ~30 small documents instead of raw logs.
+
+# Log type and the collection holding it
+LOG_SOURCES = [
+    ("symptom", "symptom_logs"),
+    ("mood", "mood_logs"),
+    ("lifestyle", "lifestyle_logs"),
+]
+
+def rollup_day(logged_at: datetime) -> str:
+    return logged_at.strftime("%Y-%m-%d")
+
+def rollup_key(value: str) -> str:
+    # Field names can't contain dots or start with $
+    return str(value).replace(".", "_").lstrip("$") or "unknown"
+
+def rollup_update(log_type: str, log: dict) -> dict:
+    inc = {}
+    update = {"$set": {"updated_at": datetime.utcnow()}, "$inc": inc}
+    
+    if log_type == "symptom":
+        inc["symptom_count"] = 1
+        inc[f"symptom_counts.{rollup_key(log['symptom_name'])}"] = 1
+    elif log_type == "mood":
+        score = log["mood_score"]
+        inc["mood_count"] = 1
+        inc["mood_sum"] = score
+        update["$min"] = {"mood_min": score}
+        update["$max"] = {"mood_max": score}
+    elif log_type == "lifestyle":
+        inc["lifestyle_count"] = 1
+        if log.get("sleep_quality"):
+            inc[f"sleep_quality_counts.{log['sleep_quality']}"] = 1
+        if log.get("stress_level"):
+            inc[f"stress_counts.{log['stress_level']}"] = 1
+        if log.get("water_intake"):
+            inc["water_intake"] = log["water_intake"]
+        if log.get("exercise_minutes"):
+            inc["exercise_minutes"] = log["exercise_minutes"]
+    
+    return update
+
+def rollup_ops(user_id: str, log_type: str, logs: List[dict]) -> List[UpdateOne]:
+    return [
+        UpdateOne(
+            {"user_id": user_id, "day": rollup_day(log["logged_at"])},
+            rollup_update(log_type, log),
+            upsert=True
+        )
+        for log in logs
+    ]
+
+async def after_log_write(user_id: str, log_type: str, logs: List[dict]) -> None:
+    """Keep derived per-user data in step with newly written logs"""
+    dashboard_cache.invalidate(user_id)
+    
+    try:
+        await db.daily_rollups.bulk_write(rollup_ops(user_id, log_type, logs), ordered=False)
+    except PyMongoError as e:
+        # The raw log is already stored; a rollup rebuild repairs the gap
+        logger.error(f"Failed to update daily rollup for user {user_id}: {e}")
+    
+    if log_type == "mood":
+        try:
+            links = await refresh_partner_snapshots(user_id)
+        except PyMongoError as e:
+            # Partner reads recompute a missing or stale snapshot
+            logger.error(f"Failed to refresh partner snapshots for user {user_id}: {e}")
+            return
+        await notify_partners(links)
+
+async def rebuild_daily_rollups(user_id: str) -> int:
+    """Recompute one user's rollups from their raw logs"""
+    await db.daily_rollups.delete_many({"user_id": user_id})
+    
+    rebuilt = 0
+    for log_type, collection in LOG_SOURCES:
+        ops = []
+        async for log in db[collection].find({"user_id": user_id}).batch_size(EXPORT_BATCH_SIZE):
+            ops.extend(rollup_ops(user_id, log_type, [log]))
+            if len(ops) >= 1000:
+                await db.daily_rollups.bulk_write(ops, ordered=False)
+                rebuilt += len(ops)
+                ops = []
+        if ops:
+            await db.daily_rollups.bulk_write(ops, ordered=False)
+            rebuilt += len(ops)
+    
+    return rebuilt
+
+async def rebuild_all_daily_rollups() -> Dict[str, int]:
+    users = 0
+    logs = 0
+    async for u in db.users.find({}, {"_id": 1}):
+        users += 1
+        logs += await rebuild_daily_rollups(str(u["_id"]))
+    
+    return {"users": users, "logs": logs}
+
+async def get_daily_rollups(user_id: str, since: datetime) -> List[dict]:
+    return await db.daily_rollups.find(
+        {"user_id": user_id, "day": {"$gte": rollup_day(since)}},
+        {"_id": 0, "user_id": 0}
+    ).sort("day", 1).to_list(None)
+
 # ==================== SYMPTOM ROUTES ====================
 
 @api_router.get("/symptoms", response_model=List[SymptomResponse])
 async def get_symptoms(
+    request: Request,
+    response: Response,
     category: Optional[SymptomCategory] = None,
     stage: Optional[MenopauseStage] = None
 ):
-    query = {"reviewed": True}
-    if category:
-        query["category"] = category.value
-    if stage:
-        query["stages"] = stage.value
+    catalog = await catalog_cache.get("symptoms")
+    symptoms = [
+        s for s in catalog["docs"]
+        if (not category or s.get("category") == category.value)
+        and (not stage or stage.value in s.get("stages", []))
+    ][:100]
+    
+    not_modified = conditional_response(request, response, view_etag(catalog["version"], symptoms))
+    if not_modified:
+        return not_modified
     
-    symptoms = await db.symptoms.find(query).to_list(100)
     return [SymptomResponse(id=str(s["_id"]), **{k: v for k, v in s.items() if k != "_id"}) for s in symptoms]
 
 @api_router.post("/symptoms", response_model=SymptomResponse)
@@ -722,11 +2042,8 @@ async def create_custom_symptom(data: SymptomCreate, user: dict = Depends(get_cu
     
     return SymptomResponse(**symptom_dict)
 
-@api_router.post("/symptom-logs", response_model=SymptomLogResponse)
-async def log_symptom(data: SymptomLogCreate, user: dict = Depends(get_current_user)):
-    user_id = str(user["_id"])
-    
-    log_dict = {
+def build_symptom_log(user_id: str, data: SymptomLogCreate, logged_at: datetime) -> dict:
+    return {
         "user_id": user_id,
         "symptom_id": data.symptom_id,
         "symptom_name": data.symptom_name,
@@ -734,26 +2051,34 @@ async def log_symptom(data: SymptomLogCreate, user: dict = Depends(get_current_u
         "severity_score": data.severity_score,
         "frequency": data.frequency.value,
         "notes": data.notes,
-        "logged_at": datetime.utcnow()
+        "logged_at": logged_at,
+        "updated_at": datetime.utcnow()
     }
+
+@api_router.post("/symptom-logs", response_model=SymptomLogResponse)
+async def log_symptom(data: SymptomLogCreate, user: dict = Depends(get_current_user)):
+    user_id = str(user["_id"])
+    
+    log_dict = build_symptom_log(user_id, data, datetime.utcnow())
     
     result = await db.symptom_logs.insert_one(log_dict)
     log_dict["id"] = str(result.inserted_id)
+    await after_log_write(user_id, "symptom", [log_dict])
     
     return SymptomLogResponse(**log_dict)
 
 @api_router.get("/symptom-logs", response_model=List[SymptomLogResponse])
 async def get_symptom_logs(
+    response: Response,
     days: int = 30,
+    cursor: Optional[str] = None,
+    limit: int = Query(LOG_PAGE_MAX_LIMIT, ge=1, le=LOG_PAGE_MAX_LIMIT),
     user: dict = Depends(get_current_user)
 ):
     user_id = str(user["_id"])
     since = datetime.utcnow() - timedelta(days=days)
     
-    logs = await db.symptom_logs.find({
-        "user_id": user_id,
-        "logged_at": {"$gte": since}
-    }).sort("logged_at", -1).to_list(500)
+    logs = await fetch_log_page(db.symptom_logs, user_id, since, cursor, limit, response)
     
     return [SymptomLogResponse(id=str(l["_id"]), **{k: v for k, v in l.items() if k != "_id"}) for l in logs]
 
@@ -771,32 +2096,40 @@ async def get_today_symptom_logs(user: dict = Depends(get_current_user)):
 
 # ==================== MOOD ROUTES ====================
 
-@api_router.post("/mood-logs", response_model=MoodLogResponse)
-async def log_mood(data: MoodLogCreate, user: dict = Depends(get_current_user)):
-    user_id = str(user["_id"])
-    
-    log_dict = {
+def build_mood_log(user_id: str, data: MoodLogCreate, logged_at: datetime) -> dict:
+    return {
         "user_id": user_id,
         "mood_score": data.mood_score,
         "emotions": data.emotions,
         "description": data.description,
-        "logged_at": datetime.utcnow()
+        "logged_at": logged_at,
+        "updated_at": datetime.utcnow()
     }
+
+@api_router.post("/mood-logs", response_model=MoodLogResponse)
+async def log_mood(data: MoodLogCreate, user: dict = Depends(get_current_user)):
+    user_id = str(user["_id"])
+    
+    log_dict = build_mood_log(user_id, data, datetime.utcnow())
     
     result = await db.mood_logs.insert_one(log_dict)
     log_dict["id"] = str(result.inserted_id)
+    await after_log_write(user_id, "mood", [log_dict])
     
     return MoodLogResponse(**log_dict)
 
 @api_router.get("/mood-logs", response_model=List[MoodLogResponse])
-async def get_mood_logs(days: int = 30, user: dict = Depends(get_current_user)):
+async def get_mood_logs(
+    response: Response,
+    days: int = 30,
+    cursor: Optional[str] = None,
+    limit: int = Query(LOG_PAGE_MAX_LIMIT, ge=1, le=LOG_PAGE_MAX_LIMIT),
+    user: dict = Depends(get_current_user)
+):
     user_id = str(user["_id"])
     since = datetime.utcnow() - timedelta(days=days)
     
-    logs = await db.mood_logs.find({
-        "user_id": user_id,
-        "logged_at": {"$gte": since}
-    }).sort("logged_at", -1).to_list(500)
+    logs = await fetch_log_page(db.mood_logs, user_id, since, cursor, limit, response)
     
     return [MoodLogResponse(id=str(l["_id"]), **{k: v for k, v in l.items() if k != "_id"}) for l in logs]
 
@@ -817,14 +2150,12 @@ async def get_today_mood(user: dict = Depends(get_current_user)):
 
 # ==================== LIFESTYLE ROUTES ====================
 
-@api_router.post("/lifestyle-logs", response_model=LifestyleLogResponse)
-async def log_lifestyle(data: LifestyleLogCreate, user: dict = Depends(get_current_user)):
-    user_id = str(user["_id"])
-    
+def build_lifestyle_log(user_id: str, data: LifestyleLogCreate, logged_at: datetime) -> dict:
     log_dict = {
         "user_id": user_id,
         **data.dict(),
-        "logged_at": datetime.utcnow()
+        "logged_at": logged_at,
+        "updated_at": datetime.utcnow()
     }
     
     # Convert enums to values
@@ -835,20 +2166,32 @@ async def log_lifestyle(data: LifestyleLogCreate, user: dict = Depends(get_curre
     if data.stress_level:
         log_dict["stress_level"] = data.stress_level.value
     
+    return log_dict
+
+@api_router.post("/lifestyle-logs", response_model=LifestyleLogResponse)
+async def log_lifestyle(data: LifestyleLogCreate, user: dict = Depends(get_current_user)):
+    user_id = str(user["_id"])
+    
+    log_dict = build_lifestyle_log(user_id, data, datetime.utcnow())
+    
     result = await db.lifestyle_logs.insert_one(log_dict)
     log_dict["id"] = str(result.inserted_id)
+    await after_log_write(user_id, "lifestyle", [log_dict])
     
     return LifestyleLogResponse(**log_dict)
 
 @api_router.get("/lifestyle-logs", response_model=List[LifestyleLogResponse])
-async def get_lifestyle_logs(days: int = 30, user: dict = Depends(get_current_user)):
+async def get_lifestyle_logs(
+    response: Response,
+    days: int = 30,
+    cursor: Optional[str] = None,
+    limit: int = Query(LOG_PAGE_MAX_LIMIT, ge=1, le=LOG_PAGE_MAX_LIMIT),
+    user: dict = Depends(get_current_user)
+):
     user_id = str(user["_id"])
     since = datetime.utcnow() - timedelta(days=days)
     
-    logs = await db.lifestyle_logs.find({
-        "user_id": user_id,
-        "logged_at": {"$gte": since}
-    }).sort("logged_at", -1).to_list(500)
+    logs = await fetch_log_page(db.lifestyle_logs, user_id, since, cursor, limit, response)
     
     return [LifestyleLogResponse(id=str(l["_id"]), **{k: v for k, v in l.items() if k != "_id"}) for l in logs]
 
@@ -867,20 +2210,802 @@ async def get_today_lifestyle(user: dict = Depends(get_current_user)):
     
     return LifestyleLogResponse(id=str(log["_id"]), **{k: v for k, v in log.items() if k != "_id"})
 
+# ==================== SYNC ROUTES ====================
+
+# How each offline log type is validated, built and stored
+SYNC_LOG_HANDLERS = {
+    SyncLogType.SYMPTOM: (SymptomLogCreate, build_symptom_log, "symptom_logs"),
+    SyncLogType.MOOD: (MoodLogCreate, build_mood_log, "mood_logs"),
+    SyncLogType.LIFESTYLE: (LifestyleLogCreate, build_lifestyle_log, "lifestyle_logs"),
+}
+
+def sync_logged_at(entry: SyncBatchEntry, now: datetime) -> datetime:
+    if entry.logged_at is None:
+        return now
+    logged_at = entry.logged_at
+    if logged_at.tzinfo is not None:
+        logged_at = logged_at.astimezone(timezone.utc).replace(tzinfo=None)
+    if logged_at > now + SYNC_MAX_CLOCK_SKEW:
+        raise ValueError("logged_at is in the future")
+    return logged_at
+
+@api_router.post("/sync/batch", response_model=SyncBatchResponse)
+async def sync_batch(data: SyncBatchRequest, user: dict = Depends(get_current_user)):
+    """Store a mixed batch of logs captured offline.
+    
+    Each entry carries a client-chosen idempotency key, so a device can
+    safely replay a batch after a dropped response.
+    """
+    user_id = str(user["_id"])
+    now = datetime.utcnow()
+    
+    results: List[SyncBatchItemResult] = []
+    pending: Dict[SyncLogType, List[tuple]] = {t: [] for t in SyncLogType}
+    first_seen: Dict[tuple, SyncBatchItemResult] = {}
+    repeats = []
+    
+    for entry in data.entries:
+        result = SyncBatchItemResult(idempotency_key=entry.idempotency_key, status="created")
+        results.append(result)
+        
+        key = (entry.type, entry.idempotency_key)
+        if key in first_seen:
+            result.status = "duplicate"
+            repeats.append((result, first_seen[key]))
+            continue
+        first_seen[key] = result
+        
+        model, build, _ = SYNC_LOG_HANDLERS[entry.type]
+        try:
+            log_dict = build(user_id, model(**entry.data), sync_logged_at(entry, now))
+        except (ValidationError, ValueError) as e:
+            result.status = "invalid"
+            result.error = str(e)
+            continue
+        
+        log_dict["idempotency_key"] = entry.idempotency_key
+        pending[entry.type].append((result, log_dict))
+    
+    for log_type, items in pending.items():
+        if not items:
+            continue
+        
+        collection = db[SYNC_LOG_HANDLERS[log_type][2]]
+        docs = [log_dict for _, log_dict in items]
+        failed = {}
+        try:
+            await collection.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            failed = {err["index"]: err for err in e.details.get("writeErrors", [])}
+        
+        duplicate_keys = []
+        created = []
+        for index, (result, log_dict) in enumerate(items):
+            error = failed.get(index)
+            if error is None:
+                result.id = str(log_dict["_id"])
+                created.append(log_dict)
+            elif error.get("code") == 11000:
+                result.status = "duplicate"
+                duplicate_keys.append(result.idempotency_key)
+            else:
+                result.status = "failed"
+                result.error = error.get("errmsg")
+        
+        # Point replayed entries at the log stored the first time round
+        if duplicate_keys:
+            existing = collection.find(
+                {"user_id": user_id, "idempotency_key": {"$in": duplicate_keys}},
+                {"idempotency_key": 1}
+            )
+            existing_ids = {doc["idempotency_key"]: str(doc["_id"]) async for doc in existing}
+            for result, _ in items:
+                if result.status == "duplicate":
+                    result.id = existing_ids.get(result.idempotency_key)
+        
+        if created:
+            await after_log_write(user_id, log_type.value, created)
+    
+    # Keys repeated within this batch share the first occurrence's log
+    for result, first in repeats:
+        result.id = first.id
+    
+    return SyncBatchResponse(results=results)
+
+# Collections a client mirrors locally; every write to them sets updated_at
+# and every delete leaves a tombstone
+SYNC_COLLECTIONS = ["symptom_logs", "mood_logs", "lifestyle_logs", "reminders", "profiles"]
+
+async def record_tombstone(user_id: str, collection: str, doc_id: str) -> None:
+    now = datetime.utcnow()
+    await db.tombstones.insert_one({
+        "user_id": user_id,
+        "collection": collection,
+        "doc_id": doc_id,
+        "deleted_at": now,
+        "updated_at": now
+    })
+
+def encode_sync_token(positions: Dict[str, list], issued_at: datetime) -> str:
+    raw = json.dumps({"issued_at": issued_at.isoformat(), "positions": positions})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_sync_token(token: str) -> tuple:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        positions = {
+            name: (datetime.fromisoformat(pos[0]), ObjectId(pos[1]))
+            for name, pos in data["positions"].items()
+        }
+        return datetime.fromisoformat(data["issued_at"]), positions
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+
+async def changed_since(collection: str, user_id: str, position: Optional[tuple], upper: datetime) -> List[dict]:
+    """Documents of one collection changed after a (updated_at, _id) position"""
+    query = {"user_id": user_id, "updated_at": {"$lt": upper}}
+    if position:
+        updated_at, doc_id = position
+        query["$or"] = [
+            {"updated_at": {"$gt": updated_at}},
+            {"updated_at": updated_at, "_id": {"$gt": doc_id}}
+        ]
+    
+    return await db[collection].find(query).sort(
+        [("updated_at", 1), ("_id", 1)]
+    ).limit(SYNC_CHANGES_LIMIT + 1).to_list(SYNC_CHANGES_LIMIT + 1)
+
+@api_router.get("/sync/changes")
+async def get_sync_changes(since: Optional[str] = None, user: dict = Depends(get_current_user)):
+    """Everything that changed in the user's synced collections since a token.
+    
+    Without a token the full current state is returned. Follow next_token
+    while has_more is true; a 410 means the token predates tombstone
+    retention and the client must resync from scratch.
+    """
+    user_id = str(user["_id"])
+    now = datetime.utcnow()
+    positions = {}
+    if since:
+        issued_at, positions = decode_sync_token(since)
+        if now - issued_at > timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS):
+            raise HTTPException(status_code=410, detail="Sync token expired, full resync required")
+    else:
+        # Documents from before delta sync have no updated_at, which the
+        # range below never matches; the startup backfill may not have run
+        await backfill_updated_at(user_id)
+    
+    upper = now - timedelta(seconds=SYNC_SETTLE_SECONDS)
+    names = SYNC_COLLECTIONS + ["tombstones"]
+    pages = await asyncio.gather(*[
+        changed_since(name, user_id, positions.get(name), upper) for name in names
+    ])
+    
+    changes = {name: {"upserts": [], "deletes": []} for name in SYNC_COLLECTIONS}
+    next_positions = {name: [p[0].isoformat(), str(p[1])] for name, p in positions.items()}
+    has_more = False
+    
+    for name, docs in zip(names, pages):
+        if len(docs) > SYNC_CHANGES_LIMIT:
+            docs = docs[:SYNC_CHANGES_LIMIT]
+            has_more = True
+        if not docs:
+            continue
+        
+        next_positions[name] = [docs[-1]["updated_at"].isoformat(), str(docs[-1]["_id"])]
+        for doc in docs:
+            if name == "tombstones":
+                if doc["collection"] in changes:
+                    changes[doc["collection"]]["deletes"].append(doc["doc_id"])
+            else:
+                doc["id"] = str(doc.pop("_id"))
+                doc.pop("idempotency_key", None)
+                changes[name]["upserts"].append(doc)
+    
+    return {
+        "changes": changes,
+        "next_token": encode_sync_token(next_positions, now),
+        "has_more": has_more
+    }
+
+async def backfill_updated_at(user_id: Optional[str] = None) -> Dict[str, int]:
+    """Give documents written before delta sync an updated_at to sync from"""
+    query = {"updated_at": {"$exists": False}}
+    if user_id:
+        query["user_id"] = user_id
+    
+    updated = {}
+    for name in SYNC_COLLECTIONS:
+        result = await db[name].update_many(query, [{"$set": {"updated_at": {
+            "$ifNull": ["$logged_at", {"$ifNull": ["$created_at", {"$toDate": "$_id"}]}]
+        }}}])
+        updated[name] = result.modified_count
+    return updated
+
+# ==================== EXPORT ROUTES ====================
+
+EXPORT_CSV_FIELDS = [
+    "type", "id", "logged_at",
+    "symptom_id", "symptom_name", "severity", "severity_score", "frequency", "notes",
+    "mood_score", "emotions", "description",
+    "sleep_hours", "sleep_quality", "food_tags", "water_intake",
+    "exercise_intensity", "exercise_type", "exercise_minutes",
+    "stress_level", "stress_source", "work_day", "relationship_notes",
+]
+
+async def merge_logs_by_time(user_id: str, since: Optional[datetime]):
+    """Yield (type, log) from all log collections in logged_at order.
+    
+    Each collection is read through its own cursor sorted by the user+time
+    index; only the head document of each cursor is held in memory.
+    """
+    query = {"user_id": user_id}
+    if since:
+        query["logged_at"] = {"$gte": since}
+    
+    cursors = [
+        db[collection].find(query, {"user_id": 0}).sort([("logged_at", 1), ("_id", 1)]).batch_size(EXPORT_BATCH_SIZE)
+        for _, collection in LOG_SOURCES
+    ]
+    
+    heap = []
+    
+    async def advance(index: int) -> None:
+        try:
+            log = await cursors[index].__anext__()
+        except StopAsyncIteration:
+            return
+        # The cursor index breaks ties so logs themselves are never compared
+        heapq.heappush(heap, (log["logged_at"], index, log))
+    
+    try:
+        for index in range(len(cursors)):
+            await advance(index)
+        
+        while heap:
+            _, index, log = heapq.heappop(heap)
+            yield LOG_SOURCES[index][0], log
+            await advance(index)
+    finally:
+        for cursor in cursors:
+            await cursor.close()
+
+def export_record(log_type: str, log: dict) -> dict:
+    record = {"type": log_type, "id": str(log.pop("_id"))}
+    for key, value in log.items():
+        record[key] = value.isoformat() if isinstance(value, datetime) else value
+    return record
+
+def csv_row(record: dict) -> dict:
+    return {k: ";".join(v) if isinstance(v, list) else v for k, v in record.items()}
+
+async def stream_export(user_id: str, since: Optional[datetime], export_format: ExportFormat):
+    buffer = io.StringIO()
+    writer = None
+    if export_format == ExportFormat.CSV:
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_CSV_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+    
+    pending = 0
+    async for log_type, log in merge_logs_by_time(user_id, since):
+        record = export_record(log_type, log)
+        if writer:
+            writer.writerow(csv_row(record))
+        else:
+            buffer.write(json.dumps(record, default=str) + "\n")
+        
+        pending += 1
+        if pending >= EXPORT_CHUNK_RECORDS:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    
+    if buffer.tell():
+        yield buffer.getvalue()
+
+@api_router.get("/export")
+async def export_health_history(
+    format: ExportFormat = ExportFormat.NDJSON,
+    days: Optional[int] = Query(None, ge=1),
+    user: dict = Depends(get_current_user)
+):
+    """Stream the user's symptom, mood and lifestyle logs, oldest first"""
+    user_id = str(user["_id"])
+    since = datetime.utcnow() - timedelta(days=days) if days else None
+    
+    media_type = "text/csv" if format == ExportFormat.CSV else "application/x-ndjson"
+    filename = f"adelphi-health-history.{format.value}"
+    
+    return StreamingResponse(
+        stream_export(user_id, since, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+# ==================== PUSH DELIVERY ====================
+
+# Outgoing notifications ({"kind", "user_id", "title", "body", "data"})
+notification_queue: asyncio.Queue = asyncio.Queue(maxsize=NOTIFICATION_QUEUE_SIZE)
+
+def enqueue_notification(notification: dict) -> None:
+    """Queue a notification from a request path without waiting on delivery"""
+    try:
+        notification_queue.put_nowait(notification)
+    except asyncio.QueueFull:
+        logger.warning(f"Notification queue full, dropped {notification['kind']} for user {notification['user_id']}")
+
+class PushTransportError(Exception):
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+class PushTransport(ABC):
+    """Sends one provider-sized batch of messages.
+    
+    send() returns one result per message, in order: {"status": "ok"} or
+    {"status": "error", "error": <code>}, where "DeviceNotRegistered" marks
+    a dead token. Batch-level failures raise PushTransportError.
+    """
+    
+    name = "base"
+    batch_size = 100
+    
+    @abstractmethod
+    async def send(self, messages: List[dict]) -> List[dict]:
+        ...
+
+class ExpoPushTransport(PushTransport):
+    name = "expo"
+    batch_size = 100  # Expo's per-request limit
+    
+    def __init__(self, url: str, access_token: Optional[str] = None):
+        self.url = url
+        self.headers = {"Accept": "application/json", "Content-Type": "application/json"}
+        if access_token:
+            self.headers["Authorization"] = f"Bearer {access_token}"
+    
+    async def send(self, messages: List[dict]) -> List[dict]:
+        try:
+            resp = await http_client.post(self.url, json=messages, headers=self.headers)
+        except httpx.HTTPError as e:
+            raise PushTransportError(f"Expo push request failed: {e}")
+        
+        if resp.status_code == 429 or resp.status_code >= 500:
+            raise PushTransportError(f"Expo push returned {resp.status_code}")
+        if resp.status_code != 200:
+            raise PushTransportError(f"Expo push returned {resp.status_code}: {resp.text[:200]}", retryable=False)
+        
+        try:
+            tickets = resp.json()["data"]
+            return [
+                {"status": "ok"} if t.get("status") == "ok"
+                else {"status": "error", "error": (t.get("details") or {}).get("error") or t.get("message")}
+                for t in tickets
+            ]
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            # Expo accepted the request, so a retry could deliver twice
+            raise PushTransportError(f"Unreadable Expo push response: {e!r}", retryable=False)
+
+def push_provider(token: str) -> str:
+    # Only Expo tokens are issued by the app today
+    return "expo"
+
+class PushDispatcher:
+    """Deliver queued notifications to every registered device of a user.
+    
+    Consumers drain the notification queue in chunks, resolve tokens with
+    one push_tokens query per chunk and send provider-sized batches.
+    Concurrent sends are capped per provider, failed batches are retried
+    with exponential backoff, and tokens the provider reports as
+    unregistered are deleted.
+    """
+    
+    def __init__(self, queue: asyncio.Queue, transports: Dict[str, PushTransport], concurrency: int):
+        self.queue = queue
+        self.transports = transports
+        self.concurrency = concurrency
+        self._semaphores = {name: asyncio.Semaphore(concurrency) for name in transports}
+        self._tasks: List[asyncio.Task] = []
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.pruned = 0
+        self.no_device = 0
+        # (monotonic time, messages) per delivered batch, for throughput
+        self._recent = deque()
+    
+    async def dispatch(self, notifications: List[dict]) -> None:
+        user_ids = list({n["user_id"] for n in notifications})
+        tokens: Dict[str, List[str]] = {}
+        async for t in db.push_tokens.find({"user_id": {"$in": user_ids}}, {"user_id": 1, "token": 1}):
+            tokens.setdefault(t["user_id"], []).append(t["token"])
+        
+        by_provider: Dict[str, List[dict]] = {}
+        for n in notifications:
+            user_tokens = tokens.get(n["user_id"])
+            if not user_tokens:
+                self.no_device += 1
+                continue
+            for token in user_tokens:
+                by_provider.setdefault(push_provider(token), []).append({
+                    "to": token,
+                    "title": n["title"],
+                    "body": n["body"],
+                    "data": {"kind": n["kind"], **n.get("data", {})},
+                    "sound": "default"
+                })
+        
+        sends = []
+        for provider, messages in by_provider.items():
+            size = self.transports[provider].batch_size
+            sends.extend(self._send_batch(provider, messages[i:i + size]) for i in range(0, len(messages), size))
+        await asyncio.gather(*sends)
+    
+    async def _send_batch(self, provider: str, messages: List[dict]) -> None:
+        transport = self.transports[provider]
+        async with self._semaphores[provider]:
+            for attempt in range(PUSH_MAX_RETRIES + 1):
+                try:
+                    results = await transport.send(messages)
+                    break
+                except PushTransportError as e:
+                    if not e.retryable or attempt == PUSH_MAX_RETRIES:
+                        logger.error(f"Dropping {len(messages)} {provider} push messages: {e}")
+                        self.failed += len(messages)
+                        return
+                    self.retries += 1
+                    await asyncio.sleep(PUSH_RETRY_BASE_SECONDS * 2 ** attempt)
+        
+        dead = []
+        for message, result in zip(messages, results):
+            if result["status"] == "ok":
+                self.sent += 1
+            else:
+                self.failed += 1
+                if result.get("error") == "DeviceNotRegistered":
+                    dead.append(message["to"])
+        if len(results) < len(messages):
+            # Messages without a ticket can't be confirmed as delivered
+            logger.error(f"{provider} returned {len(results)} results for {len(messages)} push messages")
+            self.failed += len(messages) - len(results)
+        self._recent.append((time.monotonic(), len(messages)))
+        
+        if dead:
+            try:
+                result = await db.push_tokens.delete_many({"token": {"$in": dead}})
+                self.pruned += result.deleted_count
+            except PyMongoError as e:
+                logger.error(f"Failed to prune {len(dead)} dead push tokens: {e}")
+    
+    async def _consume(self) -> None:
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < 500 and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            try:
+                await self.dispatch(batch)
+            except PyMongoError as e:
+                logger.error(f"Failed to dispatch {len(batch)} notifications: {e}")
+                self.failed += len(batch)
+            except Exception:
+                # Keep the consumer alive; a dead one silently stops delivery
+                logger.exception(f"Unexpected error dispatching {len(batch)} notifications")
+                self.failed += len(batch)
+    
+    def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._consume()) for _ in range(self.concurrency)]
+    
+    async def stop(self, drain_seconds: float = 5.0) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        
+        # Best effort for notifications already claimed (e.g. fired reminders)
+        pending = []
+        while not self.queue.empty():
+            pending.append(self.queue.get_nowait())
+        if pending:
+            try:
+                await asyncio.wait_for(self.dispatch(pending), timeout=drain_seconds)
+            except (asyncio.TimeoutError, PyMongoError) as e:
+                logger.error(f"Shutdown drain of {len(pending)} notifications incomplete: {e!r}")
+    
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        while self._recent and now - self._recent[0][0] > 60:
+            self._recent.popleft()
+        return {
+            "queued": self.queue.qsize(),
+            "sent": self.sent,
+            "failed": self.failed,
+            "retries": self.retries,
+            "pruned_tokens": self.pruned,
+            "no_device": self.no_device,
+            "messages_per_second": round(sum(n for _, n in self._recent) / 60, 2)
+        }
+
+push_dispatcher = PushDispatcher(
+    notification_queue,
+    {"expo": ExpoPushTransport(PUSH_API_URL, EXPO_ACCESS_TOKEN)},
+    PUSH_CONCURRENCY
+)
+
+# ==================== REMINDER SCHEDULER ====================
+
+MINUTES_PER_WEEK = 7 * 24 * 60
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+REMINDER_MESSAGES = {
+    "water": "Time for a glass of water",
+    "walk": "Time for a short walk",
+    "bedtime": "Time to start winding down for bed",
+    "medication": "Time to take your medication"
+}
+
+def minute_of_week(dt: datetime) -> int:
+    return dt.weekday() * 1440 + dt.hour * 60 + dt.minute
+
+def reminder_minutes(reminder: dict) -> List[int]:
+    """Local minutes-of-week a reminder fires at; empty days means daily"""
+    hour, minute = (int(part) for part in reminder["time"].split(":"))
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        raise ValueError(f"Invalid reminder time {reminder['time']!r}")
+    days = [WEEKDAYS.index(d[:3].lower()) for d in reminder.get("days") or []] or range(7)
+    return sorted({d * 1440 + hour * 60 + minute for d in days})
+
+def reminder_zone(name: Optional[str]) -> ZoneInfo:
+    try:
+        return ZoneInfo(name or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Unknown timezone: {name}")
+
+def check_reminder_schedule(time_str: str, days: Optional[List[str]]) -> None:
+    try:
+        reminder_minutes({"time": time_str, "days": days})
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid reminder time or days")
+
+class ReminderIndex:
+    """Enabled reminders bucketed by timezone and local minute-of-week"""
+    
+    def __init__(self):
+        # timezone -> minute_of_week -> reminder ids
+        self.buckets: Dict[str, Dict[int, Set[str]]] = {}
+        # reminder id -> (timezone, minutes) for O(1) removal
+        self.entries: Dict[str, tuple] = {}
+        self._sorted: Dict[str, List[int]] = {}
+    
+    def add(self, reminder: dict) -> None:
+        reminder_id = str(reminder["_id"])
+        self.remove(reminder_id)
+        if not reminder.get("enabled", True):
+            return
+        
+        zone = reminder.get("timezone") or "UTC"
+        try:
+            ZoneInfo(zone)
+            minutes = reminder_minutes(reminder)
+        except (ZoneInfoNotFoundError, KeyError, ValueError) as e:
+            logger.warning(f"Not scheduling reminder {reminder_id}: {e}")
+            return
+        
+        buckets = self.buckets.setdefault(zone, {})
+        for m in minutes:
+            buckets.setdefault(m, set()).add(reminder_id)
+        self.entries[reminder_id] = (zone, minutes)
+        self._sorted.pop(zone, None)
+    
+    def remove(self, reminder_id: str) -> None:
+        entry = self.entries.pop(reminder_id, None)
+        if not entry:
+            return
+        
+        zone, minutes = entry
+        buckets = self.buckets[zone]
+        for m in minutes:
+            buckets[m].discard(reminder_id)
+            if not buckets[m]:
+                del buckets[m]
+        if not buckets:
+            del self.buckets[zone]
+        self._sorted.pop(zone, None)
+    
+    @staticmethod
+    def skipped_wall_time(slot: datetime, tz: ZoneInfo) -> Optional[datetime]:
+        """The local time a spring-forward gap skipped that maps to this UTC minute"""
+        local = slot.astimezone(tz)
+        gap = local.utcoffset() - (slot - timedelta(days=1)).astimezone(tz).utcoffset()
+        if gap <= timedelta(0):
+            return None
+        wall = local.replace(tzinfo=None) - gap
+        # fold=0 resolves a nonexistent time with the offset from before the
+        # gap, the same way next_slot() picks the wake-up minute; a wall time
+        # that exists maps elsewhere
+        if wall.replace(tzinfo=tz).astimezone(timezone.utc) == slot:
+            return wall
+        return None
+    
+    def due(self, slot: datetime) -> List[str]:
+        """Reminder ids whose local time matches a UTC minute"""
+        ids = []
+        for zone, buckets in self.buckets.items():
+            tz = ZoneInfo(zone)
+            local = slot.astimezone(tz)
+            if local.fold:
+                # Second pass through a fall-back hour; these fired on the first
+                continue
+            ids.extend(buckets.get(minute_of_week(local), ()))
+            skipped = self.skipped_wall_time(slot, tz)
+            if skipped:
+                ids.extend(buckets.get(minute_of_week(skipped), ()))
+        return ids
+    
+    def next_slot(self, after: datetime) -> Optional[datetime]:
+        """Earliest UTC minute after `after` with a non-empty bucket"""
+        best = None
+        for zone, buckets in self.buckets.items():
+            keys = self._sorted.get(zone)
+            if keys is None:
+                keys = self._sorted[zone] = sorted(buckets)
+            
+            tz = ZoneInfo(zone)
+            local = after.astimezone(tz).replace(second=0, microsecond=0, tzinfo=None)
+            current = minute_of_week(local)
+            i = bisect_right(keys, current)
+            wait = keys[i] - current if i < len(keys) else keys[0] + MINUTES_PER_WEEK - current
+            # Wall-clock arithmetic so DST shifts land on the right UTC minute
+            slot = (local + timedelta(minutes=wait)).replace(tzinfo=tz).astimezone(timezone.utc)
+            if best is None or slot < best:
+                best = slot
+        return best
+
+class ReminderScheduler:
+    """Fire reminders at their local time without scanning the collection.
+    
+    The in-memory index is kept current by the reminder routes and rebuilt
+    from Mongo every REMINDER_RESYNC_SECONDS. The loop sleeps until the next
+    non-empty bucket (or until the index changes), then atomically claims
+    each due reminder for that slot via last_fired_slot, so several workers
+    running a scheduler never send the same reminder twice.
+    """
+    
+    def __init__(self, queue: asyncio.Queue):
+        self.queue = queue
+        self.index = ReminderIndex()
+        self._changed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._last_slot: Optional[datetime] = None
+        self._loaded_at: Optional[float] = None
+        self.fired = 0
+    
+    def add(self, reminder: dict) -> None:
+        self.index.add(reminder)
+        self._changed.set()
+    
+    def remove(self, reminder_id: str) -> None:
+        self.index.remove(reminder_id)
+        self._changed.set()
+    
+    async def load(self) -> None:
+        index = ReminderIndex()
+        async for r in db.reminders.find(
+            {"enabled": True},
+            {"time": 1, "days": 1, "enabled": 1, "timezone": 1}
+        ):
+            index.add(r)
+        self.index = index
+        self._loaded_at = time.monotonic()
+    
+    async def _claim(self, reminder_id: str, slot: datetime) -> Optional[dict]:
+        slot_value = slot.replace(tzinfo=None)
+        return await db.reminders.find_one_and_update(
+            {"_id": ObjectId(reminder_id), "enabled": True, "last_fired_slot": {"$ne": slot_value}},
+            {"$set": {"last_fired_slot": slot_value}},
+            projection={"user_id": 1, "type": 1, "title": 1, "custom_message": 1}
+        )
+    
+    async def fire_due(self, now: datetime) -> int:
+        """Claim and enqueue reminders for every slot since the last run"""
+        current = now.replace(second=0, microsecond=0)
+        start = current - timedelta(minutes=REMINDER_CATCHUP_MINUTES - 1)
+        if self._last_slot is not None:
+            start = max(start, self._last_slot + timedelta(minutes=1))
+        
+        fired = 0
+        slot = start
+        while slot <= current:
+            due = self.index.due(slot)
+            for i in range(0, len(due), 100):
+                claimed = await asyncio.gather(*(self._claim(rid, slot) for rid in due[i:i + 100]))
+                for r in claimed:
+                    if r:
+                        await self.queue.put(self.notification(r))
+                        fired += 1
+            slot += timedelta(minutes=1)
+        
+        self._last_slot = current
+        self.fired += fired
+        return fired
+    
+    @staticmethod
+    def notification(reminder: dict) -> dict:
+        return {
+            "kind": "reminder",
+            "user_id": reminder["user_id"],
+            "title": reminder["title"],
+            "body": reminder.get("custom_message") or REMINDER_MESSAGES.get(reminder["type"], reminder["title"]),
+            "data": {"reminder_id": str(reminder["_id"]), "type": reminder["type"]}
+        }
+    
+    async def _run(self) -> None:
+        while True:
+            try:
+                if self._loaded_at is None or time.monotonic() - self._loaded_at >= REMINDER_RESYNC_SECONDS:
+                    await self.load()
+                
+                now = datetime.now(timezone.utc)
+                if self._last_slot is None:
+                    self._last_slot = now.replace(second=0, microsecond=0) - timedelta(minutes=1)
+                
+                self._changed.clear()
+                wake = self.index.next_slot(self._last_slot)
+                if wake:
+                    # An ambiguous wall time (DST fall-back) can map behind us
+                    wake = max(wake, self._last_slot + timedelta(minutes=1))
+                delay = (wake - now).total_seconds() if wake else REMINDER_RESYNC_SECONDS
+                delay = min(delay, REMINDER_RESYNC_SECONDS - (time.monotonic() - self._loaded_at))
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self._changed.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+                
+                await self.fire_due(datetime.now(timezone.utc))
+            except PyMongoError as e:
+                logger.error(f"Reminder scheduler error: {e}")
+                await asyncio.sleep(5)
+    
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "scheduled": len(self.index.entries),
+            "timezones": len(self.index.buckets),
+            "fired": self.fired,
+            "queued_notifications": self.queue.qsize()
+        }
+
+reminder_scheduler = ReminderScheduler(notification_queue)
+
 # ==================== REMINDER ROUTES ====================
 
 @api_router.post("/reminders", response_model=ReminderResponse)
 async def create_reminder(data: ReminderCreate, user: dict = Depends(get_current_user)):
     user_id = str(user["_id"])
     
+    reminder_zone(data.timezone)
+    check_reminder_schedule(data.time, data.days)
+    
     reminder_dict = {
         "user_id": user_id,
         **data.dict(),
         "created_at": datetime.utcnow()
     }
+    reminder_dict["updated_at"] = reminder_dict["created_at"]
     
     result = await db.reminders.insert_one(reminder_dict)
     reminder_dict["id"] = str(result.inserted_id)
+    reminder_scheduler.add(reminder_dict)
     
     return ReminderResponse(**reminder_dict)
 
@@ -896,15 +3021,25 @@ async def update_reminder(reminder_id: str, data: ReminderUpdate, user: dict = D
     user_id = str(user["_id"])
     
     update_data = {k: v for k, v in data.dict().items() if v is not None}
+    if "timezone" in update_data:
+        reminder_zone(update_data["timezone"])
+    if "time" in update_data or "days" in update_data:
+        # Each field is checked on its own; the stored one was valid already
+        check_reminder_schedule(update_data.get("time", "00:00"), update_data.get("days"))
+    update_data["updated_at"] = datetime.utcnow()
     
-    result = await db.reminders.update_one(
+    reminder = await db.reminders.find_one_and_update(
         {"_id": ObjectId(reminder_id), "user_id": user_id},
-        {"$set": update_data}
+        {"$set": update_data},
+        projection={"time": 1, "days": 1, "enabled": 1, "timezone": 1},
+        return_document=ReturnDocument.AFTER
     )
     
-    if result.modified_count == 0:
+    if not reminder:
         raise HTTPException(status_code=404, detail="Reminder not found")
     
+    reminder_scheduler.add(reminder)
+    
     return {"success": True}
 
 @api_router.delete("/reminders/{reminder_id}")
@@ -919,39 +3054,74 @@ async def delete_reminder(reminder_id: str, user: dict = Depends(get_current_use
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Reminder not found")
     
+    reminder_scheduler.remove(reminder_id)
+    await record_tombstone(user_id, "reminders", reminder_id)
+    
     return {"success": True}
 
 # ==================== ARTICLE ROUTES ====================
 
-@api_router.get("/articles", response_model=List[ArticleResponse])
-async def get_articles(
-    category: Optional[str] = None,
-    stage: Optional[MenopauseStage] = None,
-    audience: Optional[str] = None,
-    search: Optional[str] = None
-):
-    query = {}
+def article_search_query(search: str, category: Optional[str], stage: Optional[MenopauseStage], audience: Optional[str]) -> dict:
+    query = {"$text": {"$search": search}}
     if category:
         query["category"] = category
     if stage:
         query["stages"] = stage.value
     if audience:
         query["audience"] = audience
-    if search:
-        query["$or"] = [
-            {"title": {"$regex": search, "$options": "i"}},
-            {"content": {"$regex": search, "$options": "i"}},
-            {"tags": {"$regex": search, "$options": "i"}}
-        ]
+    return query
+
+@api_router.get("/articles", response_model=List[ArticleResponse])
+async def get_articles(
+    request: Request,
+    response: Response,
+    category: Optional[str] = None,
+    stage: Optional[MenopauseStage] = None,
+    audience: Optional[str] = None,
+    search: Optional[str] = None,
+    page: int = Query(1, ge=1),
+    limit: int = Query(100, ge=1, le=100)
+):
+    skip = (page - 1) * limit
     
-    articles = await db.articles.find(query).sort("created_at", -1).to_list(100)
+    if search:
+        # Served by the article_search text index, best matches first
+        query = article_search_query(search, category, stage, audience)
+        articles = await db.articles.find(query, {"score": {"$meta": "textScore"}}).sort(
+            [("score", {"$meta": "textScore"}), ("created_at", -1)]
+        ).skip(skip).limit(limit).to_list(limit)
+    else:
+        catalog = await catalog_cache.get("articles")
+        articles = sorted(
+            (
+                a for a in catalog["docs"]
+                if (not category or a.get("category") == category)
+                and (not stage or stage.value in a.get("stages", []))
+                and (not audience or a.get("audience") == audience)
+            ),
+            key=lambda a: a["created_at"],
+            reverse=True
+        )[skip:skip + limit]
+        
+        not_modified = conditional_response(request, response, view_etag(catalog["version"], articles))
+        if not_modified:
+            return not_modified
     return [ArticleResponse(id=str(a["_id"]), **{k: v for k, v in a.items() if k != "_id"}) for a in articles]
 
 @api_router.get("/articles/{article_id}", response_model=ArticleResponse)
-async def get_article(article_id: str):
-    article = await db.articles.find_one({"_id": ObjectId(article_id)})
+async def get_article(article_id: str, request: Request, response: Response):
+    catalog = await catalog_cache.get("articles")
+    article = catalog["by_id"].get(article_id)
     if not article:
-        raise HTTPException(status_code=404, detail="Article not found")
+        # May have been created by another process since the catalog loaded
+        article = await db.articles.find_one({"_id": ObjectId(article_id)})
+        if not article:
+            raise HTTPException(status_code=404, detail="Article not found")
+        catalog_cache.invalidate("articles")
+    
+    not_modified = conditional_response(request, response, docs_etag([article]), doc_version(article))
+    if not_modified:
+        return not_modified
     
     return ArticleResponse(id=str(article["_id"]), **{k: v for k, v in article.items() if k != "_id"})
 
@@ -969,6 +3139,7 @@ async def create_article(data: ArticleCreate, user: dict = Depends(get_current_u
     
     result = await db.articles.insert_one(article_dict)
     article_dict["id"] = str(result.inserted_id)
+    catalog_cache.invalidate("articles")
     
     return ArticleResponse(**article_dict)
 
@@ -1002,6 +3173,130 @@ async def get_bookmarked_articles(user: dict = Depends(get_current_user)):
     articles = await db.articles.find({"_id": {"$in": article_ids}}).to_list(100)
     return [ArticleResponse(id=str(a["_id"]), **{k: v for k, v in a.items() if k != "_id"}) for a in articles]
 
+# ==================== PARTNER SNAPSHOTS ====================
+
+# Each active partner link stores a snapshot of what the partner dashboard
+# shows. It is refreshed when the primary user logs a mood or the link
+# settings change, so partner reads are a single keyed lookup.
+
+def partner_actions(today_status: str) -> List[str]:
+    if today_status == "challenging":
+        return [
+            "Send a caring message or thoughtful emoji",
+            "Offer to help with a household task",
+            "Give her some quiet time and space"
+        ]
+    elif today_status == "easier":
+        return [
+            "Share something positive with her",
+            "Plan a relaxing activity together",
+            "Express appreciation for her"
+        ]
+    return [
+        "Check in with a kind message",
+        "Offer to make her favorite drink",
+        "Ask how she's feeling today"
+    ]
+
+async def load_partner_mood_data(primary_user_id: str) -> tuple:
+    now = datetime.utcnow()
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    week_ago = now - timedelta(days=7)
+    
+    today_mood, recent_moods = await asyncio.gather(
+        db.mood_logs.find_one({
+            "user_id": primary_user_id,
+            "logged_at": {"$gte": today_start}
+        }, sort=[("logged_at", -1)]),
+        db.mood_logs.find({
+            "user_id": primary_user_id,
+            "logged_at": {"$gte": week_ago}
+        }).sort("logged_at", 1).to_list(30)
+    )
+    return today_start, today_mood, recent_moods
+
+def build_partner_snapshot(today_start: datetime, today_mood: Optional[dict], recent_moods: List[dict], share_mood: bool) -> dict:
+    # Today's mood only counts if it is shared
+    today_status = "neutral"
+    if share_mood and today_mood:
+        if today_mood["mood_score"] <= 3:
+            today_status = "challenging"
+        elif today_mood["mood_score"] >= 7:
+            today_status = "easier"
+    
+    mood_trend = "stable"
+    if len(recent_moods) >= 3:
+        first_half = sum(m["mood_score"] for m in recent_moods[:len(recent_moods)//2])
+        second_half = sum(m["mood_score"] for m in recent_moods[len(recent_moods)//2:])
+        if second_half > first_half + 2:
+            mood_trend = "improving"
+        elif second_half < first_half - 2:
+            mood_trend = "declining"
+    
+    return {
+        "day": today_start,
+        "today_status": today_status,
+        "recent_mood_trend": mood_trend,
+        "suggested_actions": partner_actions(today_status),
+        "last_updated": datetime.utcnow()
+    }
+
+async def compute_partner_snapshot(primary_user_id: str, share_mood: bool) -> dict:
+    return build_partner_snapshot(*await load_partner_mood_data(primary_user_id), share_mood)
+
+async def refresh_partner_snapshots(primary_user_id: str) -> List[dict]:
+    """Recompute the snapshot on every active link of a primary user"""
+    links = await db.partner_links.find(
+        {"primary_user_id": primary_user_id, "is_active": True},
+        {
+            "partner_user_id": 1, "primary_user_name": 1, "share_mood": 1, "enable_notifications": 1,
+            "snapshot.day": 1, "snapshot.today_status": 1
+        }
+    ).to_list(20)
+    if not links:
+        return []
+    
+    mood_data = await load_partner_mood_data(primary_user_id)
+    ops = []
+    for link in links:
+        link["previous_snapshot"] = link.get("snapshot")
+        link["snapshot"] = build_partner_snapshot(*mood_data, link.get("share_mood", True))
+        ops.append(UpdateOne({"_id": link["_id"]}, {"$set": {"snapshot": link["snapshot"]}}))
+    
+    await db.partner_links.bulk_write(ops, ordered=False)
+    return links
+
+async def notify_partners(links: List[dict]) -> None:
+    """Push the fresh status to sharing partners and alert on a challenging day"""
+    for link in links:
+        if not link.get("share_mood", True):
+            continue
+        snapshot = link["snapshot"]
+        await pubsub.publish(f"partner:{link['partner_user_id']}", "partner_status", {
+            "primary_user_name": link["primary_user_name"],
+            "today_status": snapshot["today_status"],
+            "recent_mood_trend": snapshot["recent_mood_trend"],
+            "last_updated": snapshot["last_updated"].isoformat()
+        })
+        
+        # Alert once when the day turns challenging, not on every mood log
+        previous = link.get("previous_snapshot") or {}
+        became_challenging = snapshot["today_status"] == "challenging" and (
+            previous.get("today_status") != "challenging" or previous.get("day") != snapshot["day"]
+        )
+        if became_challenging and link.get("enable_notifications", True):
+            name = link["primary_user_name"]
+            try:
+                await enqueue_job("push", {"notifications": [{
+                    "kind": "partner_alert",
+                    "user_id": link["partner_user_id"],
+                    "title": f"Check in with {name}",
+                    "body": f"{name} is having a challenging day. A little support can go a long way.",
+                    "data": {"today_status": "challenging"}
+                }]})
+            except PyMongoError as e:
+                logger.error(f"Failed to queue partner alert for link {link['_id']}: {e}")
+
 # ==================== PARTNER ROUTES ====================
 
 @api_router.post("/partner/invite", response_model=PartnerInviteResponse)
@@ -1057,6 +3352,7 @@ async def accept_partner_invite(invite_code: str, user: dict = Depends(get_curre
         "created_at": datetime.utcnow()
     }
     
+    link_dict["snapshot"] = await compute_partner_snapshot(invite["primary_user_id"], invite["share_mood"])
     await db.partner_links.insert_one(link_dict)
     
     # Mark invite as used
@@ -1070,6 +3366,7 @@ async def accept_partner_invite(invite_code: str, user: dict = Depends(get_curre
         {"_id": ObjectId(partner_user_id)},
         {"$set": {"role": "partner"}}
     )
+    user_cache.invalidate(partner_user_id)
     
     return {"success": True, "primary_user_name": invite["primary_user_name"]}
 
@@ -1082,12 +3379,12 @@ async def get_partner_link(user: dict = Depends(get_current_user)):
         link = await db.partner_links.find_one({
             "primary_user_id": user_id,
             "is_active": True
-        })
+        }, {"snapshot": 0})
     else:
         link = await db.partner_links.find_one({
             "partner_user_id": user_id,
             "is_active": True
-        })
+        }, {"snapshot": 0})
     
     if not link:
         return None
@@ -1110,7 +3407,7 @@ async def revoke_partner_link(user: dict = Depends(get_current_user)):
 async def get_partner_dashboard(user: dict = Depends(get_current_user)):
     user_id = str(user["_id"])
     
-    # Find the link
+    # Find the link - it carries the precomputed snapshot
     link = await db.partner_links.find_one({
         "partner_user_id": user_id,
         "is_active": True
@@ -1119,67 +3416,34 @@ async def get_partner_dashboard(user: dict = Depends(get_current_user)):
     if not link:
         raise HTTPException(status_code=404, detail="No active partner link found")
     
-    primary_user_id = link["primary_user_id"]
+    snapshot = link.get("snapshot")
     today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-    
-    # Get today's mood if shared
-    today_status = "neutral"
-    if link.get("share_mood", True):
-        mood = await db.mood_logs.find_one({
-            "user_id": primary_user_id,
-            "logged_at": {"$gte": today_start}
-        }, sort=[("logged_at", -1)])
-        
-        if mood:
-            if mood["mood_score"] <= 3:
-                today_status = "challenging"
-            elif mood["mood_score"] >= 7:
-                today_status = "easier"
-    
-    # Get mood trend
-    week_ago = datetime.utcnow() - timedelta(days=7)
-    recent_moods = await db.mood_logs.find({
-        "user_id": primary_user_id,
-        "logged_at": {"$gte": week_ago}
-    }).sort("logged_at", 1).to_list(30)
-    
-    mood_trend = "stable"
-    if len(recent_moods) >= 3:
-        first_half = sum(m["mood_score"] for m in recent_moods[:len(recent_moods)//2])
-        second_half = sum(m["mood_score"] for m in recent_moods[len(recent_moods)//2:])
-        if second_half > first_half + 2:
-            mood_trend = "improving"
-        elif second_half < first_half - 2:
-            mood_trend = "declining"
-    
-    # Generate suggested actions
-    actions = []
-    if today_status == "challenging":
-        actions = [
-            "Send a caring message or thoughtful emoji",
-            "Offer to help with a household task",
-            "Give her some quiet time and space"
-        ]
-    elif today_status == "easier":
-        actions = [
-            "Share something positive with her",
-            "Plan a relaxing activity together",
-            "Express appreciation for her"
-        ]
-    else:
-        actions = [
-            "Check in with a kind message",
-            "Offer to make her favorite drink",
-            "Ask how she's feeling today"
-        ]
+    if not snapshot or snapshot["day"] != today_start:
+        # First read of the day (or a link that predates snapshots)
+        snapshot = await compute_partner_snapshot(link["primary_user_id"], link.get("share_mood", True))
+        await db.partner_links.update_one({"_id": link["_id"]}, {"$set": {"snapshot": snapshot}})
     
     return PartnerDashboard(
         primary_user_name=link["primary_user_name"],
-        today_status=today_status,
-        recent_mood_trend=mood_trend,
-        suggested_actions=actions,
-        last_updated=datetime.utcnow()
+        today_status=snapshot["today_status"],
+        recent_mood_trend=snapshot["recent_mood_trend"],
+        suggested_actions=snapshot["suggested_actions"],
+        last_updated=snapshot["last_updated"]
+    )
+
+@api_router.get("/partner/events")
+async def stream_partner_events(request: Request, user: dict = Depends(get_current_user)):
+    """Server-sent partner_status events whenever the linked user logs a mood"""
+    user_id = str(user["_id"])
+    
+    link = await db.partner_links.find_one(
+        {"partner_user_id": user_id, "is_active": True},
+        {"_id": 1}
     )
+    if not link:
+        raise HTTPException(status_code=404, detail="No active partner link found")
+    
+    return event_stream_response(request, f"partner:{user_id}", user_id)
 
 @api_router.put("/partner/settings")
 async def update_partner_settings(data: PartnerInviteCreate, user: dict = Depends(get_current_user)):
@@ -1194,11 +3458,350 @@ async def update_partner_settings(data: PartnerInviteCreate, user: dict = Depend
             "enable_notifications": data.enable_notifications
         }}
     )
+    await refresh_partner_snapshots(user_id)
     
     return {"success": True}
 
 # ==================== COMMUNITY ROUTES ====================
 
+def group_response(g: dict) -> GroupResponse:
+    return GroupResponse(
+        id=str(g["_id"]),
+        name=g["name"],
+        description=g["description"],
+        topics=g.get("topics", []),
+        member_count=g.get("member_count", 0),
+        is_public=g.get("is_public", True),
+        created_at=g["created_at"]
+    )
+
+async def increment_counter(collection, doc_id: ObjectId, field: str, delta: int, recount, set_fields: Optional[dict] = None, projection: Optional[dict] = None) -> Optional[dict]:
+    """$inc a denormalized counter, seeding it on documents that predate it.
+    
+    $inc on a missing field starts from 0, which would store 1 for a legacy
+    group with 50 members and hide it from the fill_missing_* fallbacks for
+    good. Those documents get $set to recount() instead, which must already
+    include the change being counted. Returns the updated document.
+    """
+    set_fields = set_fields or {}
+    update = {"$inc": {field: delta}}
+    if set_fields:
+        update["$set"] = set_fields
+    doc = await collection.find_one_and_update(
+        {"_id": doc_id, field: {"$exists": True}},
+        update,
+        projection=projection,
+        return_document=ReturnDocument.AFTER
+    )
+    if doc is not None or not await collection.find_one({"_id": doc_id, field: {"$exists": False}}, {"_id": 1}):
+        return doc
+    
+    actual = await recount()
+    doc = await collection.find_one_and_update(
+        {"_id": doc_id, field: {"$exists": False}},
+        {"$set": {field: actual, **set_fields}},
+        projection=projection,
+        return_document=ReturnDocument.AFTER
+    )
+    if doc is None:
+        # A concurrent writer seeded it from its own recount first
+        doc = await collection.find_one({"_id": doc_id}, projection)
+    return doc
+
+async def count_members(group_ids: Optional[List[str]]) -> Dict[str, int]:
+    """Member counts for many groups in a single aggregation"""
+    pipeline = [{"$group": {"_id": "$group_id", "count": {"$sum": 1}}}]
+    if group_ids is not None:
+        pipeline.insert(0, {"$match": {"group_id": {"$in": group_ids}}})
+    
+    return {row["_id"]: row["count"] async for row in db.group_members.aggregate(pipeline)}
+
+async def count_group_members(group_id: str) -> int:
+    return await db.group_members.count_documents({"group_id": group_id})
+
+async def fill_missing_member_counts(groups: List[dict]) -> None:
+    """Fill in member_count for groups created before the counter existed"""
+    missing = [str(g["_id"]) for g in groups if "member_count" not in g]
+    if not missing:
+        return
+    
+    counts = await count_members(missing)
+    for g in groups:
+        if "member_count" not in g:
+            g["member_count"] = counts.get(str(g["_id"]), 0)
+
+async def reconcile_group_member_counts() -> Dict[str, int]:
+    """Repair drift between groups.member_count and group_members"""
+    counts = await count_members(None)
+    
+    updates = []
+    checked = 0
+    async for g in db.groups.find({}, {"member_count": 1}):
+        checked += 1
+        actual = counts.get(str(g["_id"]), 0)
+        if g.get("member_count") != actual:
+            updates.append(UpdateOne({"_id": g["_id"]}, {"$set": {"member_count": actual}}))
+    
+    if updates:
+        await db.groups.bulk_write(updates, ordered=False)
+    
+    return {"checked": checked, "repaired": len(updates)}
+
+def post_response(p: dict) -> PostResponse:
+    return PostResponse(
+        id=str(p["_id"]),
+        group_id=p["group_id"],
+        user_id=p["user_id"],
+        user_name=p["user_name"],
+        content=p["content"],
+        reactions=p.get("reactions", {}),
+        comment_count=p.get("comment_count", 0),
+        created_at=p["created_at"]
+    )
+
+async def count_comments(post_ids: Optional[List[str]]) -> Dict[str, int]:
+    """Comment counts for many posts in a single aggregation"""
+    pipeline = [{"$group": {"_id": "$post_id", "count": {"$sum": 1}}}]
+    if post_ids is not None:
+        pipeline.insert(0, {"$match": {"post_id": {"$in": post_ids}}})
+    
+    return {row["_id"]: row["count"] async for row in db.comments.aggregate(pipeline)}
+
+async def fill_missing_comment_counts(posts: List[dict]) -> None:
+    """Fill in comment_count for posts created before the counter existed"""
+    missing = [str(p["_id"]) for p in posts if "comment_count" not in p]
+    if not missing:
+        return
+    
+    counts = await count_comments(missing)
+    for p in posts:
+        if "comment_count" not in p:
+            p["comment_count"] = counts.get(str(p["_id"]), 0)
+
+async def reconcile_post_comment_counts() -> Dict[str, int]:
+    """Backfill posts.comment_count and repair drift against comments"""
+    counts = await count_comments(None)
+    
+    checked = 0
+    repaired = 0
+    updates = []
+    async for p in db.posts.find({}, {"comment_count": 1}):
+        checked += 1
+        actual = counts.get(str(p["_id"]), 0)
+        if p.get("comment_count") != actual:
+            updates.append(UpdateOne({"_id": p["_id"]}, {"$set": {"comment_count": actual}}))
+        # Flush in chunks so a large posts collection isn't held in memory
+        if len(updates) >= 1000:
+            await db.posts.bulk_write(updates, ordered=False)
+            repaired += len(updates)
+            updates = []
+    
+    if updates:
+        await db.posts.bulk_write(updates, ordered=False)
+        repaired += len(updates)
+    
+    return {"checked": checked, "repaired": repaired}
+
+REACTION_MAX_LENGTH = 32
+
+def is_valid_reaction(reaction: str) -> bool:
+    # Reactions (emoji in the app) become field names under posts.reactions,
+    # where a dot would nest and a leading $ would be read as an operator
+    return (
+        0 < len(reaction) <= REACTION_MAX_LENGTH
+        and not reaction.startswith("$")
+        and "." not in reaction
+        and "\0" not in reaction
+    )
+
+# Server codes for write errors that may succeed if sent again (stepdowns,
+# shutdowns, network blips, write conflicts)
+RETRYABLE_WRITE_CODES = frozenset({6, 7, 89, 91, 112, 189, 262, 9001, 10107, 11600, 11602, 13435, 13436})
+
+def is_retryable_write_error(error: PyMongoError) -> bool:
+    return isinstance(error, ConnectionFailure) or error.has_error_label("RetryableWriteError")
+
+class ReactionBuffer:
+    """Write-behind buffer for post reactions.
+    
+    Taps are summed per post and reaction type and written as one
+    unordered bulk_write of $inc updates, so a viral post costs one write
+    per flush instead of one per tap. Each flush also broadcasts the
+    deltas to the posts' group streams as a single reactions event.
+    Deltas that fail with a retryable error are re-queued for the next
+    interval, up to max_retries flushes per post; anything else is logged
+    and dropped. The buffer is drained on shutdown.
+    """
+    
+    def __init__(self, flush_interval_ms: int, max_events: int, max_retries: int = REACTION_MAX_RETRIES):
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_events = max_events
+        self.max_retries = max_retries
+        # post_id -> reaction -> delta
+        self._pending: Dict[str, Dict[str, int]] = {}
+        # post_id -> consecutive failed flushes
+        self._failures: Dict[str, int] = {}
+        self._events = 0
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.flushes = 0
+        self.written = 0
+        self.dropped = 0
+    
+    def add(self, post_id: str, reaction: str, count: int = 1) -> None:
+        reactions = self._pending.setdefault(post_id, {})
+        reactions[reaction] = reactions.get(reaction, 0) + count
+        self._events += count
+        if self._events >= self.max_events:
+            self._wakeup.set()
+    
+    def pending_for(self, post_ids: List[str]) -> Dict[str, Dict[str, int]]:
+        """Unflushed deltas for these posts, so readers see their own taps"""
+        return {pid: dict(self._pending[pid]) for pid in post_ids if pid in self._pending}
+    
+    def _requeue(self, deltas: Dict[str, Dict[str, int]]) -> int:
+        """Put failed deltas back without waking the flush loop; returns taps dropped"""
+        dropped = 0
+        for post_id, reactions in deltas.items():
+            failures = self._failures.get(post_id, 0) + 1
+            if failures > self.max_retries:
+                self._failures.pop(post_id, None)
+                dropped += sum(reactions.values())
+                continue
+            self._failures[post_id] = failures
+            pending = self._pending.setdefault(post_id, {})
+            for reaction, count in reactions.items():
+                pending[reaction] = pending.get(reaction, 0) + count
+                self._events += count
+        self.dropped += dropped
+        return dropped
+    
+    def _drop(self, deltas: Dict[str, Dict[str, int]]) -> int:
+        dropped = sum(sum(reactions.values()) for reactions in deltas.values())
+        for post_id in deltas:
+            self._failures.pop(post_id, None)
+        self.dropped += dropped
+        return dropped
+    
+    async def flush(self) -> bool:
+        """Write pending deltas; False if any were re-queued for a retry"""
+        async with self._lock:
+            pending, self._pending = self._pending, {}
+            self._events = 0
+            if not pending:
+                return True
+            
+            post_ids = list(pending)
+            now = datetime.utcnow()
+            ops = [
+                UpdateOne(
+                    {"_id": ObjectId(post_id)},
+                    {
+                        "$inc": {f"reactions.{r}": n for r, n in pending[post_id].items()},
+                        "$set": {"updated_at": now}
+                    }
+                )
+                for post_id in post_ids
+            ]
+            
+            ok = True
+            try:
+                await db.posts.bulk_write(ops, ordered=False)
+            except BulkWriteError as e:
+                # Unordered: everything but the reported ops was applied
+                retry, failed = {}, {}
+                for err in e.details.get("writeErrors", []):
+                    post_id = post_ids[err["index"]]
+                    (retry if err.get("code") in RETRYABLE_WRITE_CODES else failed)[post_id] = pending[post_id]
+                dropped = self._requeue(retry) + self._drop(failed)
+                logger.error(
+                    f"Reaction flush failed for {len(retry) + len(failed)} posts "
+                    f"({len(retry)} re-queued, {dropped} taps dropped): {e}"
+                )
+                pending = {pid: d for pid, d in pending.items() if pid not in retry and pid not in failed}
+                ok = not retry
+            except PyMongoError as e:
+                if is_retryable_write_error(e):
+                    dropped = self._requeue(pending)
+                    logger.error(f"Reaction flush failed, re-queued {len(pending)} posts ({dropped} taps dropped): {e}")
+                else:
+                    dropped = self._drop(pending)
+                    logger.error(f"Reaction flush failed, dropped {dropped} taps: {e}")
+                return False
+            
+            for post_id in pending:
+                self._failures.pop(post_id, None)
+            self.flushes += 1
+            self.written += len(pending)
+        
+        await self._broadcast(pending)
+        return ok
+    
+    async def _broadcast(self, deltas: Dict[str, Dict[str, int]]) -> None:
+        if not deltas:
+            return
+        try:
+            posts = await db.posts.find(
+                {"_id": {"$in": [ObjectId(pid) for pid in deltas]}},
+                {"group_id": 1}
+            ).to_list(None)
+        except PyMongoError as e:
+            logger.error(f"Failed to look up groups for reaction broadcast: {e}")
+            return
+        
+        by_group: Dict[str, Dict[str, Dict[str, int]]] = {}
+        for p in posts:
+            by_group.setdefault(p["group_id"], {})[str(p["_id"])] = deltas[str(p["_id"])]
+        for group_id, group_deltas in by_group.items():
+            await pubsub.publish(f"group:{group_id}", "reactions", {"posts": group_deltas})
+    
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            # Shielded so stop() can't cancel a bulk_write with the deltas in hand
+            if not await asyncio.shield(self.flush()):
+                # Mongo is failing; hold off a full interval even if taps pile up
+                await asyncio.sleep(self.flush_interval)
+    
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+    
+    async def stop(self, timeout: float = REACTION_DRAIN_SECONDS) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        
+        deadline = time.monotonic() + timeout
+        while True:
+            if await self.flush() and not self._pending:
+                return
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self._pending:
+                break
+            await asyncio.sleep(min(self.flush_interval, remaining))
+        
+        if self._pending:
+            logger.error(
+                f"Reaction buffer stopped with {self._events} taps on {len(self._pending)} posts unwritten"
+            )
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending_posts": len(self._pending),
+            "pending_events": self._events,
+            "flushes": self.flushes,
+            "posts_written": self.written,
+            "taps_dropped": self.dropped
+        }
+
+reaction_buffer = ReactionBuffer(REACTION_FLUSH_INTERVAL_MS, REACTION_FLUSH_MAX_EVENTS)
+
 @api_router.get("/groups", response_model=List[GroupResponse])
 async def get_groups(topic: Optional[str] = None):
     query = {"is_public": True}
@@ -1206,31 +3809,27 @@ async def get_groups(topic: Optional[str] = None):
         query["topics"] = topic
     
     groups = await db.groups.find(query).to_list(50)
+    await fill_missing_member_counts(groups)
     
-    result = []
-    for g in groups:
-        member_count = await db.group_members.count_documents({"group_id": str(g["_id"])})
-        result.append(GroupResponse(
-            id=str(g["_id"]),
-            name=g["name"],
-            description=g["description"],
-            topics=g.get("topics", []),
-            member_count=member_count,
-            is_public=g.get("is_public", True),
-            created_at=g["created_at"]
-        ))
-    
-    return result
+    return [group_response(g) for g in groups]
 
 @api_router.post("/groups/{group_id}/join")
 async def join_group(group_id: str, user: dict = Depends(get_current_user)):
     user_id = str(user["_id"])
     
-    await db.group_members.update_one(
-        {"group_id": group_id, "user_id": user_id},
-        {"$set": {"joined_at": datetime.utcnow()}},
-        upsert=True
-    )
+    try:
+        result = await db.group_members.update_one(
+            {"group_id": group_id, "user_id": user_id},
+            {"$set": {"joined_at": datetime.utcnow()}},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        # A concurrent join for the same user won the upsert
+        return {"success": True}
+    
+    # Only a new membership moves the counter, so repeated joins are no-ops
+    if result.upserted_id is not None and ObjectId.is_valid(group_id):
+        await increment_counter(db.groups, ObjectId(group_id), "member_count", 1, lambda: count_group_members(group_id))
     
     return {"success": True}
 
@@ -1238,7 +3837,10 @@ async def join_group(group_id: str, user: dict = Depends(get_current_user)):
 async def leave_group(group_id: str, user: dict = Depends(get_current_user)):
     user_id = str(user["_id"])
     
-    await db.group_members.delete_one({"group_id": group_id, "user_id": user_id})
+    result = await db.group_members.delete_one({"group_id": group_id, "user_id": user_id})
+    
+    if result.deleted_count and ObjectId.is_valid(group_id):
+        await increment_counter(db.groups, ObjectId(group_id), "member_count", -1, lambda: count_group_members(group_id))
     
     return {"success": True}
 
@@ -1250,41 +3852,44 @@ async def get_joined_groups(user: dict = Depends(get_current_user)):
     group_ids = [ObjectId(m["group_id"]) for m in memberships]
     
     groups = await db.groups.find({"_id": {"$in": group_ids}}).to_list(50)
+    await fill_missing_member_counts(groups)
     
-    result = []
-    for g in groups:
-        member_count = await db.group_members.count_documents({"group_id": str(g["_id"])})
-        result.append(GroupResponse(
-            id=str(g["_id"]),
-            name=g["name"],
-            description=g["description"],
-            topics=g.get("topics", []),
-            member_count=member_count,
-            is_public=g.get("is_public", True),
-            created_at=g["created_at"]
-        ))
-    
-    return result
+    return [group_response(g) for g in groups]
 
 @api_router.get("/groups/{group_id}/posts", response_model=List[PostResponse])
-async def get_group_posts(group_id: str):
+async def get_group_posts(group_id: str, request: Request, response: Response):
     posts = await db.posts.find({"group_id": group_id}).sort("created_at", -1).to_list(50)
     
-    result = []
+    # Taps still in this process's reaction buffer; the app refetches right
+    # after reacting, usually before the next flush
+    pending = reaction_buffer.pending_for([str(p["_id"]) for p in posts])
+    
+    # Every post write bumps updated_at, so ids + versions identify the feed
+    etag = docs_etag(posts)
+    last_modified = max((doc_version(p) for p in posts), default=None)
+    if pending:
+        # Unflushed taps aren't in updated_at, so only the ETag can cover them
+        etag = view_etag(etag + json.dumps(pending, sort_keys=True), posts)
+        last_modified = None
+    not_modified = conditional_response(request, response, etag, last_modified)
+    if not_modified:
+        return not_modified
+    
+    await fill_missing_comment_counts(posts)
     for p in posts:
-        comment_count = await db.comments.count_documents({"post_id": str(p["_id"])})
-        result.append(PostResponse(
-            id=str(p["_id"]),
-            group_id=p["group_id"],
-            user_id=p["user_id"],
-            user_name=p["user_name"],
-            content=p["content"],
-            reactions=p.get("reactions", {}),
-            comment_count=comment_count,
-            created_at=p["created_at"]
-        ))
-    
-    return result
+        reactions = p.setdefault("reactions", {})
+        for reaction, count in pending.get(str(p["_id"]), {}).items():
+            reactions[reaction] = reactions.get(reaction, 0) + count
+    
+    return [post_response(p) for p in posts]
+
+@api_router.get("/groups/{group_id}/stream")
+async def stream_group_activity(group_id: str, request: Request, user: dict = Depends(get_current_user)):
+    """Server-sent post, comment and batched reactions events for a group"""
+    if not ObjectId.is_valid(group_id) or not await db.groups.find_one({"_id": ObjectId(group_id)}, {"_id": 1}):
+        raise HTTPException(status_code=404, detail="Group not found")
+    
+    return event_stream_response(request, f"group:{group_id}", str(user["_id"]))
 
 @api_router.post("/posts", response_model=PostResponse)
 async def create_post(data: PostCreate, user: dict = Depends(get_current_user)):
@@ -1296,21 +3901,28 @@ async def create_post(data: PostCreate, user: dict = Depends(get_current_user)):
         "user_name": user["name"],
         "content": data.content,
         "reactions": {},
+        "comment_count": 0,
         "created_at": datetime.utcnow()
     }
+    post_dict["updated_at"] = post_dict["created_at"]
     
     result = await db.posts.insert_one(post_dict)
     post_dict["id"] = str(result.inserted_id)
-    post_dict["comment_count"] = 0
     
-    return PostResponse(**post_dict)
+    post = PostResponse(**post_dict)
+    await pubsub.publish(f"group:{data.group_id}", "post", jsonable_encoder(post))
+    
+    return post
 
 @api_router.post("/posts/{post_id}/react/{reaction}")
 async def react_to_post(post_id: str, reaction: str, user: dict = Depends(get_current_user)):
-    await db.posts.update_one(
-        {"_id": ObjectId(post_id)},
-        {"$inc": {f"reactions.{reaction}": 1}}
-    )
+    if not ObjectId.is_valid(post_id):
+        raise HTTPException(status_code=404, detail="Post not found")
+    if not is_valid_reaction(reaction):
+        raise HTTPException(status_code=400, detail="Invalid reaction")
+    
+    # Written and broadcast to the group stream on the next buffer flush
+    reaction_buffer.add(post_id, reaction)
     
     return {"success": True}
 
@@ -1342,19 +3954,46 @@ async def create_comment(post_id: str, data: CommentCreate, user: dict = Depends
     result = await db.comments.insert_one(comment_dict)
     comment_dict["id"] = str(result.inserted_id)
     
-    return CommentResponse(**comment_dict)
+    comment = CommentResponse(**comment_dict)
+    
+    if ObjectId.is_valid(post_id):
+        post = await increment_counter(
+            db.posts, ObjectId(post_id), "comment_count", 1,
+            lambda: db.comments.count_documents({"post_id": post_id}),
+            set_fields={"updated_at": datetime.utcnow()},
+            projection={"group_id": 1, "comment_count": 1}
+        )
+        if post:
+            await pubsub.publish(f"group:{post['group_id']}", "comment", {
+                **jsonable_encoder(comment),
+                "comment_count": post["comment_count"]
+            })
+    
+    return comment
 
 # ==================== EVENT ROUTES ====================
 
 @api_router.get("/events", response_model=List[EventResponse])
-async def get_events(event_type: Optional[str] = None, upcoming_only: bool = True):
-    query = {}
-    if event_type:
-        query["event_type"] = event_type
-    if upcoming_only:
-        query["start_time"] = {"$gte": datetime.utcnow()}
-    
-    events = await db.events.find(query).sort("start_time", 1).to_list(50)
+async def get_events(
+    request: Request,
+    response: Response,
+    event_type: Optional[str] = None,
+    upcoming_only: bool = True
+):
+    catalog = await catalog_cache.get("events")
+    now = datetime.utcnow()
+    events = sorted(
+        (
+            e for e in catalog["docs"]
+            if (not event_type or e.get("event_type") == event_type)
+            and (not upcoming_only or e["start_time"] >= now)
+        ),
+        key=lambda e: e["start_time"]
+    )[:50]
+    
+    not_modified = conditional_response(request, response, view_etag(catalog["version"], events))
+    if not_modified:
+        return not_modified
     
     return [EventResponse(id=str(e["_id"]), **{k: v for k, v in e.items() if k != "_id"}) for e in events]
 
@@ -1379,6 +4018,7 @@ async def create_event(data: EventCreate, user: dict = Depends(get_current_user)
     
     result = await db.events.insert_one(event_dict)
     event_dict["id"] = str(result.inserted_id)
+    catalog_cache.invalidate("events")
     
     return EventResponse(**event_dict)
 
@@ -1386,19 +4026,30 @@ async def create_event(data: EventCreate, user: dict = Depends(get_current_user)
 
 @api_router.get("/specialists", response_model=List[SpecialistResponse])
 async def get_specialists(
+    request: Request,
+    response: Response,
     specialty: Optional[str] = None,
     location: Optional[str] = None,
     is_online: Optional[bool] = None
 ):
-    query = {}
-    if specialty:
-        query["specialties"] = specialty
+    location_pattern = None
     if location:
-        query["location"] = {"$regex": location, "$options": "i"}
-    if is_online is not None:
-        query["is_online"] = is_online
+        try:
+            location_pattern = re.compile(location, re.IGNORECASE)
+        except re.error:
+            raise HTTPException(status_code=400, detail="Invalid location filter")
+    
+    catalog = await catalog_cache.get("specialists")
+    specialists = [
+        s for s in catalog["docs"]
+        if (not specialty or specialty in s.get("specialties", []))
+        and (not location_pattern or location_pattern.search(s.get("location") or ""))
+        and (is_online is None or s.get("is_online") == is_online)
+    ][:100]
     
-    specialists = await db.specialists.find(query).to_list(100)
+    not_modified = conditional_response(request, response, view_etag(catalog["version"], specialists))
+    if not_modified:
+        return not_modified
     
     return [SpecialistResponse(id=str(s["_id"]), **{k: v for k, v in s.items() if k != "_id"}) for s in specialists]
 
@@ -1422,6 +4073,7 @@ async def create_specialist(data: SpecialistCreate, user: dict = Depends(get_cur
     
     result = await db.specialists.insert_one(specialist_dict)
     specialist_dict["id"] = str(result.inserted_id)
+    catalog_cache.invalidate("specialists")
     
     return SpecialistResponse(**specialist_dict)
 
@@ -1449,21 +4101,25 @@ async def get_dashboard(user: dict = Depends(get_current_user)):
     user_id = str(user["_id"])
     today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
     
-    # Today's logs
-    today_symptoms = await db.symptom_logs.find({
-        "user_id": user_id,
-        "logged_at": {"$gte": today_start}
-    }).to_list(100)
-    
-    today_mood = await db.mood_logs.find_one({
-        "user_id": user_id,
-        "logged_at": {"$gte": today_start}
-    }, sort=[("logged_at", -1)])
+    cached = dashboard_cache.get(user_id)
+    if cached and cached[0] == today_start:
+        return cached[1]
     
-    today_lifestyle = await db.lifestyle_logs.find_one({
-        "user_id": user_id,
-        "logged_at": {"$gte": today_start}
-    }, sort=[("logged_at", -1)])
+    # Today's logs
+    today_symptoms, today_mood, today_lifestyle = await asyncio.gather(
+        db.symptom_logs.find({
+            "user_id": user_id,
+            "logged_at": {"$gte": today_start}
+        }).to_list(100),
+        db.mood_logs.find_one({
+            "user_id": user_id,
+            "logged_at": {"$gte": today_start}
+        }, sort=[("logged_at", -1)]),
+        db.lifestyle_logs.find_one({
+            "user_id": user_id,
+            "logged_at": {"$gte": today_start}
+        }, sort=[("logged_at", -1)])
+    )
     
     # Generate suggestions based on recent data
     suggestions = []
@@ -1508,7 +4164,7 @@ async def get_dashboard(user: dict = Depends(get_current_user)):
     # Limit to 3 suggestions
     suggestions = suggestions[:3]
     
-    return {
+    dashboard = {
         "has_logged_symptoms_today": len(today_symptoms) > 0,
         "has_logged_mood_today": today_mood is not None,
         "has_logged_lifestyle_today": today_lifestyle is not None,
@@ -1516,73 +4172,247 @@ async def get_dashboard(user: dict = Depends(get_current_user)):
         "today_symptom_count": len(today_symptoms),
         "suggestions": suggestions
     }
+    dashboard_cache.set(user_id, (today_start, dashboard))
+    
+    return dashboard
+
+async def top_symptoms_since(user_id: str, since: datetime, limit: int = 3) -> List[dict]:
+    pipeline = [
+        {"$match": {"user_id": user_id, "day": {"$gte": rollup_day(since)}}},
+        {"$project": {"symptoms": {"$objectToArray": {"$ifNull": ["$symptom_counts", {}]}}}},
+        {"$unwind": "$symptoms"},
+        {"$group": {"_id": "$symptoms.k", "count": {"$sum": "$symptoms.v"}}},
+        {"$sort": {"count": -1, "_id": 1}},
+        {"$limit": limit}
+    ]
+    return [{"name": row["_id"], "count": row["count"]} async for row in db.daily_rollups.aggregate(pipeline)]
+
+async def mood_summary_since(user_id: str, since: datetime) -> Optional[dict]:
+    pipeline = [
+        {"$match": {"user_id": user_id, "day": {"$gte": rollup_day(since)}}},
+        {"$group": {
+            "_id": None,
+            "total_logs": {"$sum": {"$ifNull": ["$mood_count", 0]}},
+            "score_sum": {"$sum": {"$ifNull": ["$mood_sum", 0]}}
+        }}
+    ]
+    rows = await db.daily_rollups.aggregate(pipeline).to_list(1)
+    return rows[0] if rows else None
+
+async def sleep_summary_since(user_id: str, since: datetime) -> Optional[dict]:
+    pipeline = [
+        {"$match": {"user_id": user_id, "day": {"$gte": rollup_day(since)}}},
+        {"$group": {
+            "_id": None,
+            "lifestyle_logs": {"$sum": {"$ifNull": ["$lifestyle_count", 0]}},
+            "good_sleep": {"$sum": {"$add": [
+                {"$ifNull": ["$sleep_quality_counts.good", 0]},
+                {"$ifNull": ["$sleep_quality_counts.excellent", 0]}
+            ]}}
+        }}
+    ]
+    rows = await db.daily_rollups.aggregate(pipeline).to_list(1)
+    return rows[0] if rows else None
 
 @api_router.get("/insights")
 async def get_insights(user: dict = Depends(get_current_user)):
     user_id = str(user["_id"])
-    week_ago = datetime.utcnow() - timedelta(days=7)
     month_ago = datetime.utcnow() - timedelta(days=30)
     
-    # Get recent symptom logs
-    recent_symptoms = await db.symptom_logs.find({
-        "user_id": user_id,
-        "logged_at": {"$gte": month_ago}
-    }).to_list(500)
-    
-    # Get recent mood logs
-    recent_moods = await db.mood_logs.find({
-        "user_id": user_id,
-        "logged_at": {"$gte": month_ago}
-    }).to_list(100)
-    
-    # Get recent lifestyle logs
-    recent_lifestyle = await db.lifestyle_logs.find({
-        "user_id": user_id,
-        "logged_at": {"$gte": month_ago}
-    }).to_list(100)
+    # Only the final aggregates come back from Mongo
+    top_symptoms, mood, sleep = await asyncio.gather(
+        top_symptoms_since(user_id, month_ago),
+        mood_summary_since(user_id, month_ago),
+        sleep_summary_since(user_id, month_ago)
+    )
     
     # Calculate patterns
     insights = []
     
     # Most common symptoms
-    symptom_counts = {}
-    for log in recent_symptoms:
-        name = log["symptom_name"]
-        symptom_counts[name] = symptom_counts.get(name, 0) + 1
-    
-    if symptom_counts:
-        top_symptoms = sorted(symptom_counts.items(), key=lambda x: x[1], reverse=True)[:3]
+    if top_symptoms:
         insights.append({
             "type": "symptoms",
             "title": "Your most tracked symptoms",
-            "data": [{"name": s[0], "count": s[1]} for s in top_symptoms]
+            "data": top_symptoms
         })
     
     # Mood trend
-    if recent_moods:
-        avg_mood = sum(m["mood_score"] for m in recent_moods) / len(recent_moods)
+    mood_logs = mood["total_logs"] if mood else 0
+    if mood_logs:
+        avg_mood = mood["score_sum"] / mood_logs
         insights.append({
             "type": "mood",
             "title": "Your average mood this month",
-            "data": {"average": round(avg_mood, 1), "total_logs": len(recent_moods)}
+            "data": {"average": round(avg_mood, 1), "total_logs": mood_logs}
         })
     
     # Sleep correlation with mood
-    if recent_lifestyle and recent_moods:
-        good_sleep_days = [l for l in recent_lifestyle if l.get("sleep_quality") in ["good", "excellent"]]
+    if sleep and sleep["lifestyle_logs"] and mood_logs:
+        good_sleep_days = sleep["good_sleep"]
         if good_sleep_days:
             insights.append({
                 "type": "pattern",
                 "title": "Sleep & Mood Connection",
-                "data": {"message": f"You had {len(good_sleep_days)} good sleep days this month. Quality sleep often helps with mood."}
+                "data": {"message": f"You had {good_sleep_days} good sleep days this month. Quality sleep often helps with mood."}
             })
     
     return {"insights": insights}
 
+@api_router.get("/insights/trends")
+async def get_insight_trends(days: int = Query(30, ge=1, le=366), user: dict = Depends(get_current_user)):
+    """Per-day series for trend charts, read straight from the daily rollups"""
+    user_id = str(user["_id"])
+    since = datetime.utcnow() - timedelta(days=days)
+    
+    rollups = await get_daily_rollups(user_id, since)
+    
+    return {"days": [
+        {
+            "day": day["day"],
+            "symptom_count": day.get("symptom_count", 0),
+            "symptom_counts": day.get("symptom_counts", {}),
+            "mood_average": round(day["mood_sum"] / day["mood_count"], 1) if day.get("mood_count") else None,
+            "mood_min": day.get("mood_min"),
+            "mood_max": day.get("mood_max"),
+            "sleep_quality_counts": day.get("sleep_quality_counts", {}),
+            "stress_counts": day.get("stress_counts", {}),
+            "water_intake": day.get("water_intake", 0),
+            "exercise_minutes": day.get("exercise_minutes", 0)
+        }
+        for day in rollups
+    ]}
+
+# ==================== ADMIN ROUTES ====================
+
+@api_router.get("/admin/indexes")
+async def get_index_report(user: dict = Depends(get_current_user)):
+    if user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    return await index_report()
+
+@api_router.get("/admin/password-pool")
+async def get_password_pool_stats(user: dict = Depends(get_current_user)):
+    if user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    return password_pool.stats()
+
+@api_router.get("/admin/push-stats")
+async def get_push_stats(user: dict = Depends(get_current_user)):
+    if user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    return push_dispatcher.stats()
+
+@api_router.get("/admin/cache-stats")
+async def get_cache_stats(user: dict = Depends(get_current_user)):
+    if user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    return {
+        "users": user_cache.stats(),
+        "dashboard": dashboard_cache.stats(),
+        "catalogs": catalog_cache.stats(),
+        "pubsub": pubsub.stats(),
+        "reactions": reaction_buffer.stats(),
+        "reminders": reminder_scheduler.stats()
+    }
+
+@api_router.get("/admin/slow-queries")
+async def get_slow_queries(
+    user: dict = Depends(get_current_user),
+    limit: int = Query(50, ge=1, le=SLOW_QUERY_LOG_SIZE),
+    collscan_only: bool = False
+):
+    if user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    return {
+        "threshold_ms": slow_query_log.threshold_ms,
+        "total": slow_query_log.total,
+        "queries": slow_query_log.recent(limit, collscan_only)
+    }
+
+# Repair jobs for denormalized fields, runnable by name
+MAINTENANCE_TASKS = {
+    "group-member-counts": reconcile_group_member_counts,
+    "post-comment-counts": reconcile_post_comment_counts,
+    "daily-rollups": rebuild_all_daily_rollups,
+    "sync-updated-at": backfill_updated_at,
+    "drop-retired-indexes": drop_retired_indexes,
+}
+
+# Maintenance tasks queued once per deployment, keyed by a marker in the
+# backfills collection, for derived data that older documents lack
+STARTUP_BACKFILLS = {
+    "daily-rollups-v1": "daily-rollups",
+    "sync-updated-at-v1": "sync-updated-at",
+}
+
+async def enqueue_startup_backfills() -> List[str]:
+    """Queue each backfill whose marker isn't recorded yet; returns job ids"""
+    job_ids = []
+    for marker, task in STARTUP_BACKFILLS.items():
+        try:
+            # The marker claim makes one process per deployment do the queueing
+            await db.backfills.insert_one({"_id": marker, "task": task, "queued_at": datetime.utcnow()})
+        except DuplicateKeyError:
+            continue
+        try:
+            job_ids.append(await enqueue_job("maintenance", {"task": task}))
+        except PyMongoError:
+            await db.backfills.delete_one({"_id": marker})
+            raise
+    return job_ids
+
+@api_router.post("/admin/maintenance/{task}", status_code=202)
+async def run_maintenance_task(task: str, user: dict = Depends(get_current_user)):
+    """Queue a maintenance task; poll /admin/jobs/{job_id} for the result"""
+    if user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    if task not in MAINTENANCE_TASKS:
+        raise HTTPException(status_code=404, detail="Unknown maintenance task")
+    
+    job_id = await enqueue_job("maintenance", {"task": task})
+    return {"task": task, "job_id": job_id}
+
+@api_router.get("/admin/jobs")
+async def get_job_stats(user: dict = Depends(get_current_user)):
+    if user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    counts = {}
+    async for row in db.jobs.aggregate([
+        {"$group": {"_id": {"type": "$type", "status": "$status"}, "count": {"$sum": 1}}}
+    ]):
+        counts.setdefault(row["_id"]["type"], {})[row["_id"]["status"]] = row["count"]
+    
+    return {"jobs": counts, "worker": job_worker.stats()}
+
+@api_router.get("/admin/jobs/{job_id}")
+async def get_job(job_id: str, user: dict = Depends(get_current_user)):
+    if user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    job = await db.jobs.find_one({"_id": ObjectId(job_id)}) if ObjectId.is_valid(job_id) else None
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    job["id"] = str(job.pop("_id"))
+    return job
+
 # ==================== SEED DATA ROUTE ====================
 
-@api_router.post("/seed")
+@api_router.post("/seed", status_code=202)
 async def seed_data():
+    """Queue seeding of the symptom, article, group, event and specialist catalogs"""
+    job_id = await enqueue_job("seed", {})
+    return {"message": "Seeding queued", "job_id": job_id}
+
+async def seed_catalogs(payload: dict) -> dict:
     """Seed initial data for symptoms, articles, groups, events, and specialists"""
     
     # Check if already seeded
@@ -1817,6 +4647,7 @@ If sleep problems persist, speak to your doctor. There are treatments that can h
             "description": "Share tips and support for managing hot flushes and getting better sleep",
             "topics": ["hot flushes", "sleep", "night sweats"],
             "is_public": True,
+            "member_count": 0,
             "created_at": datetime.utcnow()
         },
         {
@@ -1824,6 +4655,7 @@ If sleep problems persist, speak to your doctor. There are treatments that can h
             "description": "Support for managing menopause while maintaining a career",
             "topics": ["work", "career", "productivity"],
             "is_public": True,
+            "member_count": 0,
             "created_at": datetime.utcnow()
         },
         {
@@ -1831,6 +4663,7 @@ If sleep problems persist, speak to your doctor. There are treatments that can h
             "description": "Exercise tips, workout buddies, and staying active during menopause",
             "topics": ["exercise", "fitness", "movement"],
             "is_public": True,
+            "member_count": 0,
             "created_at": datetime.utcnow()
         },
         {
@@ -1838,6 +4671,7 @@ If sleep problems persist, speak to your doctor. There are treatments that can h
             "description": "For women experiencing perimenopause or menopause earlier than expected",
             "topics": ["early menopause", "perimenopause", "support"],
             "is_public": True,
+            "member_count": 0,
             "created_at": datetime.utcnow()
         }
     ]
@@ -1920,12 +4754,192 @@ If sleep problems persist, speak to your doctor. There are treatments that can h
     ]
     
     await db.specialists.insert_many(specialists)
+    catalog_cache.invalidate()
     
     return {"message": "Data seeded successfully", "symptoms": len(symptoms), "articles": len(articles), "groups": len(groups), "events": len(events), "specialists": len(specialists)}
 
+# ==================== BACKGROUND JOBS ====================
+
+async def enqueue_job(job_type: str, payload: dict, delay_seconds: float = 0, max_attempts: int = JOB_MAX_ATTEMPTS) -> str:
+    """Persist a job for any worker to pick up and return its id"""
+    now = datetime.utcnow()
+    result = await db.jobs.insert_one({
+        "type": job_type,
+        "payload": payload,
+        "status": "queued",
+        "attempts": 0,
+        "max_attempts": max_attempts,
+        "run_at": now + timedelta(seconds=delay_seconds),
+        "locked_until": None,
+        "locked_by": None,
+        "created_at": now,
+        "updated_at": now
+    })
+    job_worker.wake()
+    return str(result.inserted_id)
+
+async def run_maintenance_job(payload: dict) -> Any:
+    return await MAINTENANCE_TASKS[payload["task"]]()
+
+async def rebuild_user_rollups_job(payload: dict) -> dict:
+    return {"logs": await rebuild_daily_rollups(payload["user_id"])}
+
+async def deliver_notifications_job(payload: dict) -> dict:
+    await push_dispatcher.dispatch(payload["notifications"])
+    return {"notifications": len(payload["notifications"])}
+
+# Handlers take the job payload and return a BSON-serializable result. Jobs
+# are retried after failures and lock expiry, so handlers must be idempotent.
+JOB_HANDLERS = {
+    "seed": seed_catalogs,
+    "maintenance": run_maintenance_job,
+    "user-rollups": rebuild_user_rollups_job,
+    "push": deliver_notifications_job,
+}
+
+class JobWorker:
+    """Pool of workers claiming jobs from the jobs collection.
+    
+    A claim atomically flips a due job to running and hides it from other
+    workers until locked_until; the lock is extended while the handler
+    runs. If a worker dies, the lock lapses and another worker re-claims
+    the job. Failures are retried with exponential backoff until
+    max_attempts, then the job is marked failed.
+    """
+    
+    def __init__(self, handlers: Dict[str, Any]):
+        self.handlers = handlers
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self.completed = 0
+        self.retried = 0
+        self.failed = 0
+    
+    def wake(self) -> None:
+        self._wakeup.set()
+    
+    async def claim(self) -> Optional[dict]:
+        now = datetime.utcnow()
+        return await db.jobs.find_one_and_update(
+            {
+                "type": {"$in": list(self.handlers)},
+                "$or": [
+                    {"status": "queued", "run_at": {"$lte": now}},
+                    # Lock lapsed: the worker holding it crashed or stalled
+                    {"status": "running", "locked_until": {"$lte": now}}
+                ]
+            },
+            {
+                "$set": {
+                    "status": "running",
+                    "locked_by": self.worker_id,
+                    "locked_until": now + timedelta(seconds=JOB_VISIBILITY_TIMEOUT_SECONDS),
+                    "updated_at": now
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("run_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+    
+    async def _extend_lock(self, job_id: ObjectId) -> None:
+        while True:
+            await asyncio.sleep(JOB_VISIBILITY_TIMEOUT_SECONDS / 3)
+            await db.jobs.update_one(
+                {"_id": job_id, "locked_by": self.worker_id},
+                {"$set": {"locked_until": datetime.utcnow() + timedelta(seconds=JOB_VISIBILITY_TIMEOUT_SECONDS)}}
+            )
+    
+    async def _finish(self, job: dict, update: dict) -> None:
+        update["updated_at"] = datetime.utcnow()
+        await db.jobs.update_one(
+            {"_id": job["_id"], "locked_by": self.worker_id},
+            {"$set": {"locked_until": None, **update}}
+        )
+    
+    async def run(self, job: dict) -> None:
+        if job["attempts"] > job["max_attempts"]:
+            await self._finish(job, {"status": "failed", "finished_at": datetime.utcnow(), "last_error": "Lock expired on final attempt"})
+            self.failed += 1
+            return
+        
+        heartbeat = asyncio.create_task(self._extend_lock(job["_id"]))
+        try:
+            result = await self.handlers[job["type"]](job["payload"])
+        except asyncio.CancelledError:
+            # Shutting down: hand the job straight back rather than waiting out the lock
+            await self._finish(job, {"status": "queued", "run_at": datetime.utcnow()})
+            raise
+        except Exception as e:
+            logger.exception(f"Job {job['_id']} ({job['type']}) failed on attempt {job['attempts']}")
+            if job["attempts"] >= job["max_attempts"]:
+                await self._finish(job, {"status": "failed", "finished_at": datetime.utcnow(), "last_error": repr(e)})
+                self.failed += 1
+            else:
+                backoff = JOB_RETRY_BASE_SECONDS * 2 ** (job["attempts"] - 1)
+                await self._finish(job, {
+                    "status": "queued",
+                    "run_at": datetime.utcnow() + timedelta(seconds=backoff),
+                    "last_error": repr(e)
+                })
+                self.retried += 1
+        else:
+            await self._finish(job, {"status": "done", "finished_at": datetime.utcnow(), "result": result})
+            self.completed += 1
+        finally:
+            heartbeat.cancel()
+    
+    async def _loop(self) -> None:
+        while True:
+            try:
+                job = await self.claim()
+                if job:
+                    await self.run(job)
+                    continue
+            except PyMongoError as e:
+                logger.error(f"Job worker error: {e}")
+            
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=JOB_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+    
+    def start(self, concurrency: int) -> None:
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._loop()) for _ in range(concurrency)]
+    
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "worker_id": self.worker_id,
+            "workers": len(self._tasks),
+            "completed": self.completed,
+            "retried": self.retried,
+            "failed": self.failed
+        }
+
+job_worker = JobWorker(JOB_HANDLERS)
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics(request: Request):
+    if METRICS_TOKEN and request.headers.get("Authorization") != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 # Include the router
 app.include_router(api_router)
 
+# Conditional GET for JSON responses without a route-supplied ETag
+app.add_middleware(ConditionalGetMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -1933,8 +4947,53 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Last-Modified"],
 )
 
+# Outermost, so latency and sizes cover the full middleware stack
+app.add_middleware(MetricsMiddleware, router=app.router)
+
+@app.on_event("startup")
+async def create_db_indexes():
+    if not ENSURE_INDEXES_ON_STARTUP:
+        return
+    try:
+        await ensure_indexes()
+    except PyMongoError as e:
+        # Don't block the API from starting if Mongo is briefly unavailable
+        logger.error(f"Index bootstrap failed: {e}")
+
+@app.on_event("startup")
+async def queue_startup_backfills():
+    if not RUN_STARTUP_BACKFILLS:
+        return
+    try:
+        job_ids = await enqueue_startup_backfills()
+    except PyMongoError as e:
+        # Retried on the next startup; the maintenance route runs them too
+        logger.error(f"Queueing startup backfills failed: {e}")
+        return
+    if job_ids:
+        logger.info(f"Queued {len(job_ids)} startup backfill jobs")
+
+@app.on_event("startup")
+async def start_background_tasks():
+    slow_query_log.attach(asyncio.get_running_loop())
+    google_keys.start()
+    reaction_buffer.start()
+    push_dispatcher.start()
+    if JOB_WORKER_CONCURRENCY:
+        job_worker.start(JOB_WORKER_CONCURRENCY)
+    if RUN_REMINDER_SCHEDULER:
+        reminder_scheduler.start()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await google_keys.stop()
+    await reaction_buffer.stop()
+    await reminder_scheduler.stop()
+    await job_worker.stop()
+    await push_dispatcher.stop()
+    await http_client.aclose()
+    password_pool.shutdown()
     client.close()
@@ -0,0 +1,45 @@
+"""Standalone worker for the Mongo-backed job queue.
+
+Run next to the API to keep slow work (seeding, maintenance, rollup
+rebuilds, push fan-out) out of the web processes:
+
+    cd backend && python worker.py
+
+Set JOB_WORKER_CONCURRENCY=0 on the API processes so only workers claim
+jobs; scale out by starting more worker processes.
+"""
+import asyncio
+import signal
+
+from server import (
+    JOB_WORKER_CONCURRENCY,
+    client,
+    http_client,
+    job_worker,
+    logger,
+    push_dispatcher,
+    slow_query_log,
+)
+
+async def main():
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    slow_query_log.attach(loop)
+    concurrency = max(JOB_WORKER_CONCURRENCY, 1)
+    push_dispatcher.start()
+    job_worker.start(concurrency)
+    logger.info(f"Job worker {job_worker.worker_id} started with {concurrency} workers")
+
+    await stop.wait()
+
+    logger.info(f"Job worker {job_worker.worker_id} shutting down")
+    await job_worker.stop()
+    await push_dispatcher.stop()
+    await http_client.aclose()
+    client.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,120 @@
+"""Article search: unanchored $regex vs. the article_search text index.
+
+Seeds --articles synthetic articles (default 50k, a few hundred words
+each) and runs a set of searches both ways. For each it reports latency,
+reply bytes, and the documents the winning plan examined.
+
+The legacy query is the one get_articles used before the text index: an
+$or of three case-insensitive regexes over title, content and tags,
+newest first, capped at 100.
+
+    python tests/benchmarks/bench_article_search.py [--articles 50000] [--iterations 10]
+"""
+import argparse
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+from fastapi import Response
+from starlette.requests import Request
+
+from common import bench_database, measure, print_rows, server
+
+VOCABULARY = (
+    "hot flushes night sweats sleep insomnia anxiety mood low energy fatigue brain fog memory "
+    "concentration joint pain headaches palpitations weight skin hair hormones estrogen progesterone "
+    "hrt therapy exercise walking yoga diet calcium vitamin bone health heart partner support family "
+    "work stress relationships doctor appointment symptoms tracking stages perimenopause postmenopause "
+    "the a and of to in is for with can your you it that on this often many women may help feel"
+).split()
+CATEGORIES = ["symptoms", "stages", "lifestyle", "partner", "treatment"]
+AUDIENCES = ["primary", "partner", "family"]
+STAGES = ["pre-menopause", "peri-menopause", "menopause", "post-menopause"]
+
+SEARCHES = [
+    ("common term", "sleep", {}),
+    ("rare term", "palpitations", {}),
+    ("two terms", "brain fog", {}),
+    ("term + category", "exercise", {"category": "lifestyle"}),
+]
+
+def words(rng, count):
+    return " ".join(rng.choice(VOCABULARY) for _ in range(count))
+
+async def seed(count: int) -> None:
+    rng = random.Random(11)
+    now = datetime.utcnow()
+    batch = []
+    for i in range(count):
+        batch.append({
+            "title": words(rng, 6).capitalize(),
+            "summary": words(rng, 25),
+            "content": words(rng, rng.randrange(200, 600)),
+            "category": rng.choice(CATEGORIES),
+            "tags": rng.sample(VOCABULARY[:40], 3),
+            "stages": rng.sample(STAGES, 2),
+            "symptom_tags": [],
+            "ethnicity_tags": [],
+            "audience": rng.choice(AUDIENCES),
+            "created_at": now - timedelta(minutes=i)
+        })
+        if len(batch) == 1000:
+            await server.db.articles.insert_many(batch)
+            batch = []
+    if batch:
+        await server.db.articles.insert_many(batch)
+
+def legacy_query(search: str, filters: dict) -> dict:
+    return {
+        **filters,
+        "$or": [
+            {"title": {"$regex": search, "$options": "i"}},
+            {"content": {"$regex": search, "$options": "i"}},
+            {"tags": {"$regex": search, "$options": "i"}}
+        ]
+    }
+
+async def legacy_search(search: str, filters: dict) -> list:
+    return await server.db.articles.find(legacy_query(search, filters)).sort("created_at", -1).to_list(100)
+
+async def text_search(search: str, filters: dict) -> list:
+    request = Request({"type": "http", "method": "GET", "headers": []})
+    return await server.get_articles(
+        request, Response(),
+        category=filters.get("category"), stage=None, audience=None, search=search, page=1, limit=100
+    )
+
+async def docs_examined(cursor) -> int:
+    explain = await cursor.explain()
+    return explain["executionStats"]["totalDocsExamined"]
+
+async def main(args) -> None:
+    client, db, reply_bytes = await bench_database()
+    try:
+        await server.ensure_indexes()
+        print(f"Seeding {args.articles:,} articles...")
+        await seed(args.articles)
+
+        for label, search, filters in SEARCHES:
+            rows = [
+                await measure("legacy $regex", lambda: legacy_search(search, filters), reply_bytes, args.iterations),
+                await measure("$text index", lambda: text_search(search, filters), reply_bytes, args.iterations),
+            ]
+            print_rows(f"{label}: search={search!r} {filters or ''}", rows)
+
+            text_query = server.article_search_query(search, filters.get("category"), None, None)
+            legacy_docs = await docs_examined(db.articles.find(legacy_query(search, filters)).sort("created_at", -1).limit(100))
+            text_docs = await docs_examined(
+                db.articles.find(text_query, {"score": {"$meta": "textScore"}})
+                .sort([("score", {"$meta": "textScore"}), ("created_at", -1)]).limit(100)
+            )
+            print(f"{'docs examined':<28}legacy {legacy_docs:,} / $text {text_docs:,}")
+    finally:
+        await client.drop_database(db.name)
+        client.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=50000)
+    parser.add_argument("--iterations", type=int, default=10)
+    asyncio.run(main(parser.parse_args()))
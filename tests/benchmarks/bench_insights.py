@@ -0,0 +1,112 @@
+"""Insights: Python loops over fetched logs vs. rollup aggregation pipelines.
+
+Seeds one user with --logs symptom, mood and lifestyle logs each (default
+10k) spread over the last 30 days, then times GET /insights both ways and
+counts the reply bytes Mongo sends back for each.
+
+The legacy implementation is reproduced as it was, including its
+to_list() caps - at 10k logs it only ever tallied the first 500 symptom
+and 100 mood/lifestyle logs returned, while the pipelines count them all.
+
+    python tests/benchmarks/bench_insights.py [--logs 10000] [--iterations 20]
+"""
+import argparse
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from common import bench_database, measure, print_rows, server
+
+SYMPTOMS = ["Hot Flushes", "Night Sweats", "Brain Fog", "Fatigue", "Anxiety", "Joint Pain", "Headaches"]
+
+async def legacy_insights(user_id: str) -> dict:
+    """get_insights before the rollup pipelines"""
+    db = server.db
+    month_ago = datetime.utcnow() - timedelta(days=30)
+
+    recent_symptoms = await db.symptom_logs.find({"user_id": user_id, "logged_at": {"$gte": month_ago}}).to_list(500)
+    recent_moods = await db.mood_logs.find({"user_id": user_id, "logged_at": {"$gte": month_ago}}).to_list(100)
+    recent_lifestyle = await db.lifestyle_logs.find({"user_id": user_id, "logged_at": {"$gte": month_ago}}).to_list(100)
+
+    insights = []
+    symptom_counts = {}
+    for log in recent_symptoms:
+        name = log["symptom_name"]
+        symptom_counts[name] = symptom_counts.get(name, 0) + 1
+    if symptom_counts:
+        top_symptoms = sorted(symptom_counts.items(), key=lambda x: x[1], reverse=True)[:3]
+        insights.append({"type": "symptoms", "data": [{"name": s[0], "count": s[1]} for s in top_symptoms]})
+    if recent_moods:
+        avg_mood = sum(m["mood_score"] for m in recent_moods) / len(recent_moods)
+        insights.append({"type": "mood", "data": {"average": round(avg_mood, 1), "total_logs": len(recent_moods)}})
+    if recent_lifestyle and recent_moods:
+        good_sleep_days = [l for l in recent_lifestyle if l.get("sleep_quality") in ["good", "excellent"]]
+        if good_sleep_days:
+            insights.append({"type": "pattern", "data": {"good_sleep_days": len(good_sleep_days)}})
+    return {"insights": insights}
+
+async def seed(user_id: str, count: int) -> None:
+    rng = random.Random(8)
+    now = datetime.utcnow()
+
+    def logged_at():
+        return now - timedelta(minutes=rng.randrange(30 * 24 * 60 - 60))
+
+    symptoms = [
+        server.build_symptom_log(user_id, server.SymptomLogCreate(
+            symptom_id=str(ObjectId()),
+            symptom_name=rng.choice(SYMPTOMS),
+            severity=rng.choice(list(server.Severity)),
+            severity_score=rng.randrange(11),
+            frequency=rng.choice(list(server.Frequency)),
+            notes="Worse in the evening" if rng.random() < 0.3 else None
+        ), logged_at())
+        for _ in range(count)
+    ]
+    moods = [
+        server.build_mood_log(user_id, server.MoodLogCreate(
+            mood_score=rng.randrange(1, 11),
+            emotions=rng.sample(["anxious", "tired", "calm", "hopeful", "irritable"], 2)
+        ), logged_at())
+        for _ in range(count)
+    ]
+    lifestyle = [
+        server.build_lifestyle_log(user_id, server.LifestyleLogCreate(
+            sleep_hours=rng.uniform(4, 9),
+            sleep_quality=rng.choice(list(server.SleepQuality)),
+            food_tags=rng.sample(["caffeine", "balanced", "late_meals", "water"], 2),
+            water_intake=rng.randrange(9)
+        ), logged_at())
+        for _ in range(count)
+    ]
+
+    for collection, docs in (("symptom_logs", symptoms), ("mood_logs", moods), ("lifestyle_logs", lifestyle)):
+        for i in range(0, len(docs), 1000):
+            await server.db[collection].insert_many(docs[i:i + 1000])
+    await server.rebuild_daily_rollups(user_id)
+
+async def main(args) -> None:
+    client, db, reply_bytes = await bench_database()
+    try:
+        await server.ensure_indexes()
+        user = {"_id": ObjectId()}
+        user_id = str(user["_id"])
+        print(f"Seeding {args.logs:,} logs per type for one user...")
+        await seed(user_id, args.logs)
+
+        rows = [
+            await measure("legacy python loops", lambda: legacy_insights(user_id), reply_bytes, args.iterations),
+            await measure("rollup pipelines", lambda: server.get_insights(user=user), reply_bytes, args.iterations),
+        ]
+        print_rows(f"GET /insights, {args.logs:,} logs per type, {args.iterations} iterations", rows)
+    finally:
+        await client.drop_database(db.name)
+        client.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logs", type=int, default=10000)
+    parser.add_argument("--iterations", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,80 @@
+"""Shared plumbing for the backend benchmarks.
+
+Benchmarks run against a real MongoDB (MONGO_URL, default
+mongodb://localhost:27017) in a throwaway database that is dropped
+afterwards. They are scripts, not pytest tests:
+
+    python tests/benchmarks/bench_insights.py
+"""
+import os
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "backend"))
+
+import bson  # noqa: E402
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+from pymongo import monitoring  # noqa: E402
+from pymongo.errors import PyMongoError  # noqa: E402
+
+import server  # noqa: E402
+
+class ReplyBytes(monitoring.CommandListener):
+    """Count the BSON bytes of every server reply - what crosses the wire"""
+
+    def __init__(self):
+        self.total = 0
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self.total += len(bson.encode(event.reply))
+
+    def failed(self, event):
+        pass
+
+async def bench_database():
+    """Point server.db at a fresh database; returns (client, db, reply counter)"""
+    reply_bytes = ReplyBytes()
+    client = AsyncIOMotorClient(
+        os.environ["MONGO_URL"],
+        serverSelectionTimeoutMS=3000,
+        event_listeners=[reply_bytes]
+    )
+    try:
+        await client.admin.command("ping")
+    except PyMongoError as e:
+        sys.exit(f"MongoDB is not reachable at {os.environ['MONGO_URL']}: {e}")
+
+    db = client[f"adelphi_bench_{uuid.uuid4().hex[:8]}"]
+    server.client = client
+    server.db = db
+    return client, db, reply_bytes
+
+async def measure(name, fn, reply_bytes, iterations):
+    """Run fn() `iterations` times; returns a result row"""
+    await fn()  # warm caches and the connection pool
+    timings = []
+    bytes_before = reply_bytes.total
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "name": name,
+        "median_ms": statistics.median(timings),
+        "p95_ms": timings[max(int(len(timings) * 0.95) - 1, 0)],
+        "reply_bytes": (reply_bytes.total - bytes_before) // iterations
+    }
+
+def print_rows(title, rows):
+    print(f"\n{title}")
+    print(f"{'':<28}{'median ms':>12}{'p95 ms':>12}{'bytes/call':>14}")
+    for row in rows:
+        print(f"{row['name']:<28}{row['median_ms']:>12.1f}{row['p95_ms']:>12.1f}{row['reply_bytes']:>14,}")
@@ -0,0 +1,42 @@
+import asyncio
+import os
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+import server  # noqa: E402
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+from pymongo.errors import PyMongoError  # noqa: E402
+
+@pytest.fixture
+def run_in_db(monkeypatch):
+    """Run an async test body against a throwaway database on MONGO_URL.
+
+    Skips when MongoDB isn't reachable. The body receives the database,
+    which is also installed as server.db, and it is dropped afterwards.
+    """
+    def run(body):
+        async def wrapper():
+            client = AsyncIOMotorClient(os.environ["MONGO_URL"], serverSelectionTimeoutMS=1000)
+            try:
+                await client.admin.command("ping")
+            except PyMongoError:
+                client.close()
+                pytest.skip(f"MongoDB not reachable at {os.environ['MONGO_URL']}")
+
+            db = client[f"adelphi_test_{uuid.uuid4().hex[:8]}"]
+            monkeypatch.setattr(server, "db", db)
+            try:
+                return await body(db)
+            finally:
+                await client.drop_database(db.name)
+                client.close()
+
+        return asyncio.run(wrapper())
+
+    return run
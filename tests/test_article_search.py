@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+
+from fastapi import Response
+from starlette.requests import Request
+
+import server
+from server import MenopauseStage, article_search_query
+
+def article(title, content, category="symptoms", stages=("menopause",), audience="primary", tags=(), age_days=0):
+    return {
+        "title": title,
+        "summary": title,
+        "content": content,
+        "category": category,
+        "tags": list(tags),
+        "stages": list(stages),
+        "symptom_tags": [],
+        "ethnicity_tags": [],
+        "audience": audience,
+        "created_at": datetime.utcnow() - timedelta(days=age_days)
+    }
+
+ARTICLES = [
+    article("Hot flushes explained", "Why hot flushes happen and what helps."),
+    article("Sleep and night sweats", "Night sweats and hot flushes can break up sleep.", category="lifestyle"),
+    article("Supporting a partner through hot flushes", "How partners can help.", audience="partner"),
+    article("Hot flushes before the menopause", "Flushes can start early.", stages=("peri-menopause",)),
+    article("Joint pain", "Aches and stiffness; unrelated to flushes in title.", age_days=1),
+    article("Brain fog", "Memory and concentration."),
+]
+
+async def search(search, category=None, stage=None, audience=None, page=1, limit=100):
+    request = Request({"type": "http", "method": "GET", "headers": []})
+    return await server.get_articles(
+        request, Response(),
+        category=category, stage=stage, audience=audience, search=search, page=page, limit=limit
+    )
+
+async def seed(db):
+    await server.ensure_indexes()
+    await db.articles.insert_many([dict(a) for a in ARTICLES])
+
+def test_search_query_combines_filters_with_text():
+    query = article_search_query("hot flush", "symptoms", MenopauseStage.MENOPAUSE, "partner")
+    assert query == {
+        "$text": {"$search": "hot flush"},
+        "category": "symptoms",
+        "stages": "menopause",
+        "audience": "partner"
+    }
+    assert article_search_query("sleep", None, None, None) == {"$text": {"$search": "sleep"}}
+
+def test_search_ranks_title_matches_first(run_in_db):
+    async def body(db):
+        await seed(db)
+        results = await search("flushes")
+        titles = [a.title for a in results]
+        assert "Brain fog" not in titles
+        # Title weight 10 vs content weight 1
+        assert titles[-1] == "Joint pain"
+
+    run_in_db(body)
+
+def test_search_respects_category_stage_and_audience(run_in_db):
+    async def body(db):
+        await seed(db)
+
+        by_category = await search("flushes", category="lifestyle")
+        assert [a.title for a in by_category] == ["Sleep and night sweats"]
+
+        by_stage = await search("flushes", stage=MenopauseStage.PERI)
+        assert [a.title for a in by_stage] == ["Hot flushes before the menopause"]
+
+        by_audience = await search("flushes", audience="partner")
+        assert [a.title for a in by_audience] == ["Supporting a partner through hot flushes"]
+
+        combined = await search("flushes", category="symptoms", stage=MenopauseStage.MENOPAUSE, audience="primary")
+        assert {a.title for a in combined} == {"Hot flushes explained", "Joint pain"}
+
+    run_in_db(body)
+
+def test_search_pages_are_disjoint_and_ordered(run_in_db):
+    async def body(db):
+        await seed(db)
+        everything = [a.id for a in await search("flushes", limit=100)]
+        assert len(everything) == 5
+
+        first = [a.id for a in await search("flushes", page=1, limit=2)]
+        second = [a.id for a in await search("flushes", page=2, limit=2)]
+        third = [a.id for a in await search("flushes", page=3, limit=2)]
+        assert first + second + third == everything
+        assert await search("flushes", page=4, limit=2) == []
+
+    run_in_db(body)
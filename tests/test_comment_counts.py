@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from bson import ObjectId
+
+import server
+from server import CommentCreate
+
+USER = {"_id": ObjectId(), "name": "Ann"}
+
+async def comment_count(db, post_id):
+    return (await db.posts.find_one({"_id": ObjectId(post_id)}))["comment_count"]
+
+def test_comment_seeds_count_on_legacy_post(run_in_db):
+    async def body(db):
+        # Written before comment_count existed
+        result = await db.posts.insert_one({
+            "group_id": "g1", "user_id": "u", "user_name": "Bo", "content": "hi",
+            "reactions": {}, "created_at": datetime.utcnow()
+        })
+        post_id = str(result.inserted_id)
+        await db.comments.insert_many([
+            {"post_id": post_id, "user_id": "u", "user_name": "Bo", "content": str(i), "created_at": datetime.utcnow()}
+            for i in range(4)
+        ])
+
+        await server.create_comment(post_id, CommentCreate(content="first new"), user=USER)
+        assert await comment_count(db, post_id) == 5
+
+        await server.create_comment(post_id, CommentCreate(content="second new"), user=USER)
+        assert await comment_count(db, post_id) == 6
+
+    run_in_db(body)
+
+def test_comment_on_missing_post_writes_no_counter(run_in_db):
+    async def body(db):
+        post_id = str(ObjectId())
+        await server.create_comment(post_id, CommentCreate(content="orphan"), user=USER)
+        assert await db.posts.count_documents({}) == 0
+
+    run_in_db(body)
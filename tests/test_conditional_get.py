@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+
+from starlette.applications import Starlette
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from server import ConditionalGetMiddleware, http_date, is_not_modified
+
+def json_body(request):
+    return JSONResponse({"articles": [1, 2, 3]})
+
+def tagged(request):
+    return JSONResponse({"posts": []}, headers={"ETag": '"route-etag"'})
+
+def text(request):
+    return PlainTextResponse("metrics 1")
+
+def large(request):
+    async def chunks():
+        for _ in range(4):
+            yield b'{"pad": "' + b"x" * 20 + b'"}'
+
+    return StreamingResponse(chunks(), media_type="application/json")
+
+def client():
+    app = Starlette(routes=[
+        Route("/json", json_body, methods=["GET", "POST"]),
+        Route("/tagged", tagged),
+        Route("/text", text),
+        Route("/large", large),
+    ])
+    app.add_middleware(ConditionalGetMiddleware, max_body_bytes=64)
+    return TestClient(app)
+
+def test_json_get_is_tagged_and_revalidates_to_304():
+    c = client()
+    first = c.get("/json")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    again = c.get("/json", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+
+    assert c.get("/json", headers={"If-None-Match": f'"other", {etag}'}).status_code == 304
+    assert c.get("/json", headers={"If-None-Match": "*"}).status_code == 304
+    assert c.get("/json", headers={"If-None-Match": '"stale"'}).status_code == 200
+
+def test_non_get_passes_through():
+    response = client().post("/json")
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+
+def test_route_tagged_response_passes_through():
+    c = client()
+    response = c.get("/tagged", headers={"If-None-Match": '"something-else"'})
+    assert response.status_code == 200
+    assert response.headers["etag"] == '"route-etag"'
+
+def test_non_json_response_passes_through():
+    response = client().get("/text", headers={"If-None-Match": "*"})
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+    assert response.text == "metrics 1"
+
+def test_oversized_body_is_sent_untagged_and_whole():
+    response = client().get("/large", headers={"If-None-Match": "*"})
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+    assert response.content == (b'{"pad": "' + b"x" * 20 + b'"}') * 4
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    modified = datetime(2026, 5, 1, 12, 0, 0)
+    later = http_date(modified + timedelta(days=1))
+    earlier = http_date(modified - timedelta(days=1))
+
+    # ETag mismatch wins even though the date says not modified
+    assert not is_not_modified(Headers({"if-none-match": '"old"', "if-modified-since": later}), '"new"', modified)
+    # ETag match wins even though the date says modified
+    assert is_not_modified(Headers({"if-none-match": '"new"', "if-modified-since": earlier}), '"new"', modified)
+
+def test_if_modified_since_alone():
+    modified = datetime(2026, 5, 1, 12, 0, 0, 500000)
+    assert is_not_modified(Headers({"if-modified-since": http_date(modified)}), '"e"', modified)
+    assert not is_not_modified(Headers({"if-modified-since": http_date(modified - timedelta(seconds=1))}), '"e"', modified)
+    assert not is_not_modified(Headers({"if-modified-since": "not a date"}), '"e"', modified)
+    # Without a known modification time the date can't be checked
+    assert not is_not_modified(Headers({"if-modified-since": http_date(modified)}), '"e"', None)
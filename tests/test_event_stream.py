@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+import server
+
+def request():
+    async def receive():
+        # Client stays connected until the test closes the stream
+        await asyncio.sleep(3600)
+
+    return Request({"type": "http", "method": "GET", "headers": []}, receive)
+
+def test_unstarted_stream_holds_no_slot():
+    response = server.event_stream_response(request(), "user:a", "a")
+    assert server.sse_connections == {}
+    # A client that disconnects before the body is sent never starts the generator
+    asyncio.run(response.body_iterator.aclose())
+    assert server.sse_connections == {}
+    assert server.pubsub.stats()["subscribers"] == 0
+
+def test_stream_releases_slot_on_close():
+    async def body():
+        stream = server.sse_stream(request(), "user:a", "a")
+        assert await stream.__anext__() == "retry: 5000\n\n"
+        assert server.sse_connections == {"a": 1}
+        assert server.pubsub.stats()["subscribers"] == 1
+        await stream.aclose()
+
+    asyncio.run(body())
+    assert server.sse_connections == {}
+    assert server.pubsub.stats()["subscribers"] == 0
+
+def test_per_user_limit_is_checked_up_front(monkeypatch):
+    monkeypatch.setattr(server, "sse_connections", {"a": server.SSE_MAX_CONNECTIONS_PER_USER})
+    with pytest.raises(HTTPException) as exc:
+        server.event_stream_response(request(), "user:a", "a")
+    assert exc.value.status_code == 429
@@ -0,0 +1,168 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+import server
+
+CLIENT_ID = "test-client.apps.googleusercontent.com"
+
+def new_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+def jwk(private_key, kid):
+    key = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    return {**key, "kid": kid, "alg": "RS256", "use": "sig"}
+
+def id_token(private_key, kid, **overrides):
+    now = int(time.time())
+    claims = {
+        "iss": "https://accounts.google.com",
+        "aud": CLIENT_ID,
+        "sub": "1234567890",
+        "email": "ann@example.com",
+        "name": "Ann",
+        "iat": now,
+        "exp": now + 3600,
+        **overrides
+    }
+    return jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": kid})
+
+class KeyServer:
+    """Local stand-in for Google's certs endpoint"""
+
+    def __init__(self):
+        self.keys = []
+        self.max_age = 3600
+        self.requests = 0
+        key_server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                key_server.requests += 1
+                # Slow enough that concurrent cold callers overlap
+                time.sleep(0.05)
+                body = json.dumps({"keys": key_server.keys}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Cache-Control", f"public, max-age={key_server.max_age}")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/oauth2/v3/certs"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+@pytest.fixture
+def key_server(monkeypatch):
+    key_server = KeyServer()
+    monkeypatch.setattr(server, "GOOGLE_CERTS_URL", key_server.url)
+    monkeypatch.setattr(server, "google_keys", server.GoogleKeyCache(server.GOOGLE_CERTS_URL))
+    yield key_server
+    key_server.close()
+
+def run(coro_fn, monkeypatch):
+    """Run with a fresh shared HTTP client bound to this test's event loop"""
+    async def wrapper():
+        async with httpx.AsyncClient() as client:
+            monkeypatch.setattr(server, "http_client", client)
+            return await coro_fn()
+
+    return asyncio.run(wrapper())
+
+def test_valid_token_is_verified_locally(key_server, monkeypatch):
+    key = new_key()
+    key_server.keys = [jwk(key, "k1")]
+
+    claims = run(lambda: server.verify_google_id_token(id_token(key, "k1")), monkeypatch)
+
+    assert claims["email"] == "ann@example.com"
+    assert claims["aud"] == CLIENT_ID
+    assert key_server.requests == 1
+
+def test_keys_are_cached_between_logins(key_server, monkeypatch):
+    key = new_key()
+    key_server.keys = [jwk(key, "k1")]
+
+    async def logins():
+        for _ in range(5):
+            await server.verify_google_id_token(id_token(key, "k1"))
+
+    run(logins, monkeypatch)
+    assert key_server.requests == 1
+
+def test_bad_signature_is_rejected(key_server, monkeypatch):
+    key_server.keys = [jwk(new_key(), "k1")]
+    forged = id_token(new_key(), "k1")
+
+    with pytest.raises(jwt.InvalidSignatureError):
+        run(lambda: server.verify_google_id_token(forged), monkeypatch)
+
+def test_expired_token_is_rejected(key_server, monkeypatch):
+    key = new_key()
+    key_server.keys = [jwk(key, "k1")]
+    expired = id_token(key, "k1", iat=int(time.time()) - 7200, exp=int(time.time()) - 3600)
+
+    with pytest.raises(jwt.ExpiredSignatureError):
+        run(lambda: server.verify_google_id_token(expired), monkeypatch)
+
+def test_wrong_issuer_is_rejected(key_server, monkeypatch):
+    key = new_key()
+    key_server.keys = [jwk(key, "k1")]
+    token = id_token(key, "k1", iss="https://evil.example.com")
+
+    with pytest.raises(jwt.InvalidIssuerError):
+        run(lambda: server.verify_google_id_token(token), monkeypatch)
+
+def test_key_rotation_refetches_for_unknown_kid(key_server, monkeypatch):
+    old_key, new_key_ = new_key(), new_key()
+    key_server.keys = [jwk(old_key, "old")]
+    monkeypatch.setattr(server.google_keys, "MIN_REFRESH_INTERVAL", 0)
+
+    async def rotate():
+        await server.verify_google_id_token(id_token(old_key, "old"))
+        key_server.keys = [jwk(old_key, "old"), jwk(new_key_, "new")]
+        return await server.verify_google_id_token(id_token(new_key_, "new"))
+
+    claims = run(rotate, monkeypatch)
+    assert claims["email"] == "ann@example.com"
+    assert key_server.requests == 2
+
+def test_unknown_kid_refetch_is_rate_limited(key_server, monkeypatch):
+    key = new_key()
+    key_server.keys = [jwk(key, "k1")]
+
+    async def unknown():
+        await server.verify_google_id_token(id_token(key, "k1"))
+        for _ in range(3):
+            with pytest.raises(jwt.InvalidTokenError):
+                await server.verify_google_id_token(id_token(new_key(), "unknown"))
+
+    run(unknown, monkeypatch)
+    assert key_server.requests == 1
+
+def test_concurrent_cold_logins_fetch_keys_once(key_server, monkeypatch):
+    key = new_key()
+    key_server.keys = [jwk(key, "k1")]
+    token = id_token(key, "k1")
+
+    async def logins():
+        return await asyncio.gather(*(server.verify_google_id_token(token) for _ in range(20)))
+
+    results = run(logins, monkeypatch)
+    assert len(results) == 20
+    assert key_server.requests == 1
@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from bson import ObjectId
+
+import server
+
+USER = {"_id": ObjectId(), "name": "Ann"}
+
+async def legacy_group(db, members):
+    """A group written before member_count existed"""
+    result = await db.groups.insert_one({"name": "Legacy", "is_public": True, "created_at": datetime.utcnow()})
+    group_id = str(result.inserted_id)
+    await db.group_members.insert_many([
+        {"group_id": group_id, "user_id": str(ObjectId()), "joined_at": datetime.utcnow()}
+        for _ in range(members)
+    ])
+    return group_id
+
+async def member_count(db, group_id):
+    return (await db.groups.find_one({"_id": ObjectId(group_id)}))["member_count"]
+
+def test_join_seeds_member_count_on_legacy_group(run_in_db):
+    async def body(db):
+        group_id = await legacy_group(db, 50)
+        await server.join_group(group_id, user=USER)
+        assert await member_count(db, group_id) == 51
+
+        # Seeded once; later changes are plain increments
+        await server.leave_group(group_id, user=USER)
+        assert await member_count(db, group_id) == 50
+
+    run_in_db(body)
+
+def test_leave_seeds_member_count_on_legacy_group(run_in_db):
+    async def body(db):
+        group_id = await legacy_group(db, 3)
+        await db.group_members.insert_one({"group_id": group_id, "user_id": str(USER["_id"])})
+        await server.leave_group(group_id, user=USER)
+        assert await member_count(db, group_id) == 3
+
+    run_in_db(body)
+
+def test_join_increments_existing_count(run_in_db):
+    async def body(db):
+        result = await db.groups.insert_one({"name": "New", "member_count": 7, "created_at": datetime.utcnow()})
+        group_id = str(result.inserted_id)
+        await server.join_group(group_id, user=USER)
+        await server.join_group(group_id, user=USER)
+        assert await member_count(db, group_id) == 8
+
+    run_in_db(body)
@@ -0,0 +1,82 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import server
+from server import ExpoPushTransport, PushDispatcher, PushTransport, PushTransportError
+
+class FakeTransport(PushTransport):
+    name = "expo"
+
+    def __init__(self, results):
+        self.results = results
+
+    async def send(self, messages):
+        return self.results
+
+def messages(count):
+    return [{"to": f"ExponentPushToken[{i}]", "title": "t", "body": "b"} for i in range(count)]
+
+def test_transport_must_implement_send():
+    with pytest.raises(TypeError):
+        PushTransport()
+
+def test_missing_tickets_count_as_failed():
+    dispatcher = PushDispatcher(asyncio.Queue(), {"expo": FakeTransport([{"status": "ok"}] * 2)}, 1)
+    asyncio.run(dispatcher._send_batch("expo", messages(5)))
+    assert dispatcher.sent == 2
+    assert dispatcher.failed == 3
+
+@pytest.mark.parametrize("body", [b"<html>bad gateway</html>", b"[]", b'{"data": ["x"]}', b"{}"])
+def test_unreadable_expo_response_is_a_transport_error(monkeypatch, body):
+    async def send():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=body)))
+        monkeypatch.setattr(server, "http_client", client)
+        async with client:
+            return await ExpoPushTransport("http://push.test/send").send(messages(1))
+
+    with pytest.raises(PushTransportError) as exc:
+        asyncio.run(send())
+    assert not exc.value.retryable
+
+def test_expo_tickets_are_mapped(monkeypatch):
+    tickets = {"data": [
+        {"status": "ok", "id": "1"},
+        {"status": "error", "message": "gone", "details": {"error": "DeviceNotRegistered"}}
+    ]}
+
+    async def send():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, content=json.dumps(tickets).encode())
+        ))
+        monkeypatch.setattr(server, "http_client", client)
+        async with client:
+            return await ExpoPushTransport("http://push.test/send").send(messages(2))
+
+    assert asyncio.run(send()) == [{"status": "ok"}, {"status": "error", "error": "DeviceNotRegistered"}]
+
+def test_consumer_survives_unexpected_errors():
+    queue = asyncio.Queue()
+    dispatcher = PushDispatcher(queue, {}, 1)
+    calls = []
+
+    async def dispatch(batch):
+        calls.append(len(batch))
+        if len(calls) == 1:
+            raise KeyError("title")
+
+    dispatcher.dispatch = dispatch
+
+    async def body():
+        task = asyncio.create_task(dispatcher._consume())
+        queue.put_nowait({"user_id": "a"})
+        await asyncio.sleep(0.01)
+        queue.put_nowait({"user_id": "b"})
+        await asyncio.sleep(0.01)
+        task.cancel()
+
+    asyncio.run(body())
+    assert calls == [1, 1]
+    assert dispatcher.failed == 1
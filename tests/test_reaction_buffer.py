@@ -0,0 +1,156 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException, Response
+from pymongo.errors import AutoReconnect, BulkWriteError, OperationFailure
+from starlette.requests import Request
+
+import server
+
+POST_A, POST_B = str(ObjectId()), str(ObjectId())
+
+class FakePosts:
+    """posts collection whose bulk_write raises the queued errors in turn"""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.writes = []
+
+    async def bulk_write(self, ops, ordered=True):
+        self.writes.append(ops)
+        if self.errors:
+            raise self.errors.pop(0)
+
+    def find(self, *args, **kwargs):
+        return SimpleNamespace(to_list=self._no_posts)
+
+    async def _no_posts(self, length):
+        return []
+
+@pytest.fixture
+def posts(monkeypatch):
+    def install(*errors):
+        fake = FakePosts(*errors)
+        monkeypatch.setattr(server, "db", SimpleNamespace(posts=fake))
+        return fake
+
+    return install
+
+def write_errors(*entries):
+    return BulkWriteError({"writeErrors": [{"index": i, "code": code, "errmsg": "x"} for i, code in entries]})
+
+def test_invalid_reaction_is_rejected():
+    user = {"_id": ObjectId()}
+    for reaction in ("a.b", "$set", "❤️.x", "\0", "x" * 33, ""):
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(server.react_to_post(POST_A, reaction, user=user))
+        assert exc.value.status_code == 400
+
+def test_app_reactions_are_accepted(monkeypatch):
+    buffer = server.ReactionBuffer(250, max_events=100)
+    monkeypatch.setattr(server, "reaction_buffer", buffer)
+    user = {"_id": ObjectId()}
+    # The emoji the community screen sends, plus plain names
+    for reaction in ("❤️", "👍", "🤗", "heart", "Thumbs_Up"):
+        assert asyncio.run(server.react_to_post(POST_A, reaction, user=user)) == {"success": True}
+    assert buffer._pending == {POST_A: {"❤️": 1, "👍": 1, "🤗": 1, "heart": 1, "Thumbs_Up": 1}}
+
+def test_pending_for_returns_unflushed_deltas():
+    buffer = server.ReactionBuffer(250, max_events=100)
+    buffer.add(POST_A, "❤️")
+    buffer.add(POST_A, "❤️")
+    assert buffer.pending_for([POST_A, POST_B]) == {POST_A: {"❤️": 2}}
+    # A copy: the caller may merge it into documents freely
+    buffer.pending_for([POST_A])[POST_A]["❤️"] = 99
+    assert buffer._pending[POST_A]["❤️"] == 2
+
+def test_group_feed_includes_own_unflushed_taps(run_in_db, monkeypatch):
+    buffer = server.ReactionBuffer(250, max_events=100)
+    monkeypatch.setattr(server, "reaction_buffer", buffer)
+
+    async def get(headers=()):
+        request = Request({"type": "http", "method": "GET", "headers": list(headers)})
+        response = Response()
+        return await server.get_group_posts("g1", request, response), response
+
+    async def body(db):
+        now = server.datetime.utcnow()
+        result = await db.posts.insert_one({
+            "group_id": "g1", "user_id": "u", "user_name": "Ann", "content": "hi",
+            "reactions": {"❤️": 2}, "comment_count": 0, "created_at": now, "updated_at": now
+        })
+        _, response = await get()
+        etag = response.headers["etag"]
+
+        buffer.add(str(result.inserted_id), "❤️")
+        posts, response = await get([(b"if-none-match", etag.encode())])
+        # The tap changes the ETag, so the refetch is a full response with it
+        assert [p.reactions for p in posts] == [{"❤️": 3}]
+        assert response.headers["etag"] != etag
+
+    run_in_db(body)
+
+def test_network_error_requeues_without_waking_loop(posts):
+    posts(AutoReconnect("primary down"))
+    buffer = server.ReactionBuffer(250, max_events=2)
+    buffer.add(POST_A, "heart")
+    buffer.add(POST_A, "heart")
+    buffer._wakeup.clear()
+
+    assert asyncio.run(buffer.flush()) is False
+    assert buffer._pending == {POST_A: {"heart": 2}}
+    assert not buffer._wakeup.is_set()
+
+def test_non_retryable_error_is_dropped(posts):
+    posts(OperationFailure("bad update", code=14))
+    buffer = server.ReactionBuffer(250, max_events=100)
+    buffer.add(POST_A, "heart")
+
+    asyncio.run(buffer.flush())
+    assert buffer._pending == {}
+    assert buffer.dropped == 1
+
+def test_bulk_write_errors_requeue_only_retryable_ops(posts):
+    posts(write_errors((0, 112), (1, 14)))
+    buffer = server.ReactionBuffer(250, max_events=100)
+    buffer.add(POST_A, "heart")
+    buffer.add(POST_B, "hug", 3)
+
+    assert asyncio.run(buffer.flush()) is False
+    assert buffer._pending == {POST_A: {"heart": 1}}
+    assert buffer.dropped == 3
+
+def test_retries_are_capped(posts):
+    fake = posts(*[AutoReconnect("primary down")] * 10)
+    buffer = server.ReactionBuffer(250, max_events=100, max_retries=2)
+    buffer.add(POST_A, "heart")
+
+    async def flushes():
+        for _ in range(4):
+            await buffer.flush()
+
+    asyncio.run(flushes())
+    assert len(fake.writes) == 3
+    assert buffer._pending == {}
+    assert buffer.dropped == 1
+
+def test_stop_retries_until_written(posts):
+    fake = posts(AutoReconnect("primary down"), AutoReconnect("primary down"))
+    buffer = server.ReactionBuffer(10, max_events=100)
+    buffer.add(POST_A, "heart")
+
+    asyncio.run(buffer.stop(timeout=1))
+    assert len(fake.writes) == 3
+    assert buffer._pending == {}
+    assert buffer.written == 1
+
+def test_stop_gives_up_at_deadline(posts, caplog):
+    posts(*[AutoReconnect("primary down")] * 100)
+    buffer = server.ReactionBuffer(10, max_events=100, max_retries=100)
+    buffer.add(POST_A, "heart", 4)
+
+    asyncio.run(buffer.stop(timeout=0.05))
+    assert buffer._pending == {POST_A: {"heart": 4}}
+    assert "4 taps on 1 posts unwritten" in caplog.text
@@ -0,0 +1,177 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+import server
+from server import ReminderCreate, ReminderIndex, ReminderScheduler, ReminderUpdate
+
+USER = {"_id": ObjectId()}
+
+@pytest.mark.parametrize("time, days", [
+    ("25:00", []),
+    ("0930", []),
+    ("ab:cd", []),
+    ("09:30:00", []),
+    ("09:30", ["someday"]),
+])
+def test_create_rejects_bad_schedule(time, days):
+    data = ReminderCreate(type="water", title="Water", time=time, days=days)
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(server.create_reminder(data, user=USER))
+    assert exc.value.status_code == 400
+
+@pytest.mark.parametrize("data", [
+    ReminderUpdate(time="9"),
+    ReminderUpdate(time="12:60"),
+    ReminderUpdate(days=["mon", "xyz"]),
+])
+def test_update_rejects_bad_schedule(data):
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(server.update_reminder(str(ObjectId()), data, user=USER))
+    assert exc.value.status_code == 400
+
+def test_valid_schedule_passes():
+    server.check_reminder_schedule("07:05", ["Monday", "fri"])
+    server.check_reminder_schedule("23:59", None)
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+def index(*reminders):
+    idx = ReminderIndex()
+    for i, (time, zone, days) in enumerate(reminders):
+        idx.add({"_id": f"r{i}", "time": time, "timezone": zone, "days": days, "enabled": True})
+    return idx
+
+def test_next_slot_follows_utc_offset_through_the_year():
+    idx = index(("09:00", "Europe/London", []))
+    assert idx.next_slot(utc(2026, 1, 15, 8, 0)) == utc(2026, 1, 15, 9, 0)
+    # BST: 09:00 local is 08:00 UTC
+    assert idx.next_slot(utc(2026, 7, 15, 7, 0)) == utc(2026, 7, 15, 8, 0)
+    assert idx.next_slot(utc(2026, 7, 15, 8, 0)) == utc(2026, 7, 16, 8, 0)
+
+def test_next_slot_is_earliest_across_timezones():
+    idx = index(("09:00", "Europe/London", []), ("09:00", "Asia/Tokyo", []))
+    assert idx.next_slot(utc(2026, 1, 15, 8, 0)) == utc(2026, 1, 15, 9, 0)
+    assert idx.next_slot(utc(2026, 1, 15, 9, 0)) == utc(2026, 1, 16, 0, 0)
+
+def test_next_slot_wraps_to_next_week():
+    # 2026-01-19 is a Monday
+    idx = index(("08:00", "UTC", ["mon"]))
+    assert idx.next_slot(utc(2026, 1, 18, 12, 0)) == utc(2026, 1, 19, 8, 0)
+    assert idx.next_slot(utc(2026, 1, 19, 8, 0)) == utc(2026, 1, 26, 8, 0)
+
+def test_due_matches_local_minute_per_timezone():
+    idx = index(("09:00", "Europe/London", []), ("09:00", "Asia/Tokyo", []), ("09:00", "UTC", ["sat"]))
+    assert idx.due(utc(2026, 1, 15, 9, 0)) == ["r0"]
+    assert idx.due(utc(2026, 1, 15, 0, 0)) == ["r1"]
+    assert idx.due(utc(2026, 1, 15, 9, 1)) == []
+    assert sorted(idx.due(utc(2026, 1, 17, 9, 0))) == ["r0", "r2"]
+
+def test_removed_and_disabled_reminders_are_not_due():
+    idx = index(("09:00", "UTC", []), ("09:00", "UTC", []))
+    idx.remove("r0")
+    idx.add({"_id": "r1", "time": "09:00", "timezone": "UTC", "days": [], "enabled": False})
+    assert idx.due(utc(2026, 1, 15, 9, 0)) == []
+    assert idx.next_slot(utc(2026, 1, 15, 8, 0)) is None
+
+# Europe/London: 2026-03-29 01:00 GMT jumps to 02:00 BST, and 2026-10-25
+# 02:00 BST falls back to 01:00 GMT
+
+def test_time_skipped_by_spring_forward_fires_once():
+    idx = index(("01:30", "Europe/London", []))
+    # 01:30 local doesn't exist that night; it fires at the UTC minute it maps to
+    slot = idx.next_slot(utc(2026, 3, 29, 0, 0))
+    assert slot == utc(2026, 3, 29, 1, 30)
+    assert idx.due(slot) == ["r0"]
+    assert idx.next_slot(slot) == utc(2026, 3, 30, 0, 30)
+    assert idx.due(utc(2026, 3, 30, 0, 30)) == ["r0"]
+
+def test_time_repeated_by_fall_back_fires_once():
+    idx = index(("01:30", "Europe/London", []))
+    assert idx.next_slot(utc(2026, 10, 25, 0, 0)) == utc(2026, 10, 25, 0, 30)
+    assert idx.due(utc(2026, 10, 25, 0, 30)) == ["r0"]
+    # 01:30 GMT is the second pass through the same wall time
+    assert idx.due(utc(2026, 10, 25, 1, 30)) == []
+
+@pytest.mark.parametrize("zone, start", [
+    ("Europe/London", utc(2026, 3, 27)),
+    ("Europe/London", utc(2026, 10, 23)),
+    ("America/New_York", utc(2026, 3, 6)),
+    ("America/New_York", utc(2026, 10, 30)),
+])
+def test_every_reminder_fires_once_per_local_day_across_dst(zone, start):
+    times = ["00:30", "01:00", "01:30", "02:00", "02:30", "03:00", "12:00", "23:59"]
+    idx = index(*[(t, zone, []) for t in times])
+    tz = ZoneInfo(zone)
+
+    fired = {}
+    slot = start
+    while slot < start + timedelta(days=4):
+        for rid in idx.due(slot):
+            fired.setdefault((rid, slot.astimezone(tz).date()), []).append(slot)
+        slot += timedelta(minutes=1)
+
+    local_days = {(start + timedelta(days=d)).astimezone(tz).date() for d in range(1, 4)}
+    for i in range(len(times)):
+        for day in local_days:
+            assert len(fired.get((f"r{i}", day), [])) == 1, (times[i], day)
+
+def scheduler_with_fake_claims(*reminders):
+    scheduler = ReminderScheduler(asyncio.Queue())
+    scheduler.index = index(*reminders)
+    claimed = set()
+
+    async def claim(reminder_id, slot):
+        # Stands in for the last_fired_slot guard
+        if (reminder_id, slot) in claimed:
+            return None
+        claimed.add((reminder_id, slot))
+        return {"_id": reminder_id, "user_id": "u1", "type": "water", "title": "Water"}
+
+    scheduler._claim = claim
+    return scheduler
+
+def test_fire_due_catches_up_within_window():
+    scheduler = scheduler_with_fake_claims(("09:00", "UTC", []))
+    # Started a few minutes late: still inside the catch-up window
+    assert asyncio.run(scheduler.fire_due(utc(2026, 1, 15, 9, server.REMINDER_CATCHUP_MINUTES - 1, 30))) == 1
+    notification = scheduler.queue.get_nowait()
+    assert notification["kind"] == "reminder"
+    assert notification["body"] == server.REMINDER_MESSAGES["water"]
+
+def test_fire_due_skips_slots_older_than_window():
+    scheduler = scheduler_with_fake_claims(("09:00", "UTC", []))
+    assert asyncio.run(scheduler.fire_due(utc(2026, 1, 15, 9, server.REMINDER_CATCHUP_MINUTES))) == 0
+
+def test_fire_due_resumes_after_last_slot_without_refiring():
+    scheduler = scheduler_with_fake_claims(("09:00", "UTC", []), ("09:02", "UTC", []))
+
+    async def runs():
+        return [await scheduler.fire_due(utc(2026, 1, 15, 9, minute, 10)) for minute in (0, 1, 2, 2)]
+
+    assert asyncio.run(runs()) == [1, 0, 1, 0]
+    assert scheduler.fired == 2
+
+def test_claim_fires_each_slot_once_across_schedulers(run_in_db):
+    async def body(db):
+        result = await db.reminders.insert_one({
+            "user_id": "u1", "type": "walk", "title": "Walk", "time": "09:00",
+            "days": [], "enabled": True, "timezone": "UTC"
+        })
+        rid = str(result.inserted_id)
+        first, second = ReminderScheduler(asyncio.Queue()), ReminderScheduler(asyncio.Queue())
+        slot = utc(2026, 1, 15, 9, 0)
+
+        claims = await asyncio.gather(first._claim(rid, slot), second._claim(rid, slot))
+        assert sum(c is not None for c in claims) == 1
+        assert await first._claim(rid, slot + timedelta(days=1)) is not None
+
+        await db.reminders.update_one({"_id": result.inserted_id}, {"$set": {"enabled": False}})
+        assert await first._claim(rid, slot + timedelta(days=2)) is None
+
+    run_in_db(body)
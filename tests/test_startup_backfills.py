@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+import server
+
+def test_backfills_are_queued_once(run_in_db, monkeypatch):
+    monkeypatch.setattr(server.job_worker, "wake", lambda: None)
+
+    async def body(db):
+        first = await server.enqueue_startup_backfills()
+        assert len(first) == len(server.STARTUP_BACKFILLS)
+        # A restart, or a second worker process, finds the markers
+        assert await server.enqueue_startup_backfills() == []
+
+        jobs = await db.jobs.find({}, {"type": 1, "payload": 1}).to_list(None)
+        assert sorted(j["payload"]["task"] for j in jobs) == sorted(server.STARTUP_BACKFILLS.values())
+        assert all(j["payload"]["task"] in server.MAINTENANCE_TASKS for j in jobs)
+
+    run_in_db(body)
+
+def test_rollup_backfill_fills_insights_for_existing_logs(run_in_db):
+    async def body(db):
+        user = {"_id": ObjectId()}
+        user_id = str(user["_id"])
+        await db.users.insert_one({"_id": user["_id"], "email": "old@example.com"})
+        # Logged before daily rollups existed: no rollup documents
+        logged_at = datetime.utcnow() - timedelta(days=2)
+        await db.mood_logs.insert_many([
+            {"user_id": user_id, "mood_score": score, "emotions": [], "logged_at": logged_at}
+            for score in (4, 6, 8)
+        ])
+        assert (await server.get_insights(user=user))["insights"] == []
+
+        await server.run_maintenance_job({"task": server.STARTUP_BACKFILLS["daily-rollups-v1"]})
+
+        insights = (await server.get_insights(user=user))["insights"]
+        assert {"type": "mood", "title": "Your average mood this month",
+                "data": {"average": 6.0, "total_logs": 3}} in insights
+
+    run_in_db(body)
@@ -0,0 +1,95 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+import server
+from server import decode_sync_token, encode_sync_token
+
+USER = {"_id": ObjectId()}
+USER_ID = str(USER["_id"])
+
+def sync(since=None):
+    return server.get_sync_changes(since=since, user=USER)
+
+def mood_log(minutes_ago, **fields):
+    logged_at = datetime.utcnow() - timedelta(minutes=minutes_ago)
+    return {"user_id": USER_ID, "mood_score": 5, "emotions": [], "logged_at": logged_at, "updated_at": logged_at, **fields}
+
+def test_token_round_trip():
+    issued_at = datetime(2026, 3, 29, 1, 30, 15, 123000)
+    doc_id = ObjectId()
+    token = encode_sync_token({"mood_logs": [issued_at.isoformat(), str(doc_id)]}, issued_at)
+
+    assert "=" not in token
+    assert decode_sync_token(token) == (issued_at, {"mood_logs": (issued_at, doc_id)})
+
+@pytest.mark.parametrize("token", ["not-a-token", "e30", encode_sync_token({"x": ["bad", "bad"]}, datetime.utcnow())])
+def test_malformed_token_is_rejected(token):
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(sync(token))
+    assert exc.value.status_code == 400
+
+def test_token_older_than_tombstone_retention_is_gone():
+    issued_at = datetime.utcnow() - timedelta(days=server.SYNC_TOMBSTONE_RETENTION_DAYS, minutes=1)
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(sync(encode_sync_token({}, issued_at)))
+    assert exc.value.status_code == 410
+
+def test_full_sync_includes_documents_without_updated_at(run_in_db):
+    async def body(db):
+        # Written before delta sync: no updated_at
+        legacy = mood_log(60 * 24 * 400)
+        del legacy["updated_at"]
+        await db.mood_logs.insert_one(legacy)
+        await db.reminders.insert_one({"user_id": USER_ID, "time": "08:00", "created_at": datetime.utcnow() - timedelta(days=30)})
+        await db.profiles.insert_one({"user_id": USER_ID, "country": "UK"})
+
+        changes = (await sync())["changes"]
+        assert [d["id"] for d in changes["mood_logs"]["upserts"]] == [str(legacy["_id"])]
+        assert len(changes["reminders"]["upserts"]) == 1
+        assert len(changes["profiles"]["upserts"]) == 1
+
+    run_in_db(body)
+
+def test_pages_until_has_more_is_false(run_in_db, monkeypatch):
+    monkeypatch.setattr(server, "SYNC_CHANGES_LIMIT", 2)
+
+    async def body(db):
+        await db.mood_logs.insert_many([mood_log(50 - i) for i in range(5)])
+        await db.symptom_logs.insert_one({**mood_log(10), "symptom_name": "Fatigue"})
+
+        seen, token, pages = [], None, 0
+        while True:
+            page = await sync(token)
+            pages += 1
+            seen += [d["id"] for d in page["changes"]["mood_logs"]["upserts"]]
+            token = page["next_token"]
+            if not page["has_more"]:
+                break
+
+        assert pages == 3
+        assert len(seen) == len(set(seen)) == 5
+        # Caught up: nothing more until something changes
+        assert (await sync(token))["changes"]["mood_logs"]["upserts"] == []
+
+    run_in_db(body)
+
+def test_deletes_come_from_tombstones(run_in_db, monkeypatch):
+    monkeypatch.setattr(server, "SYNC_SETTLE_SECONDS", 0)
+
+    async def body(db):
+        result = await db.mood_logs.insert_one(mood_log(5))
+        token = (await sync())["next_token"]
+
+        await db.mood_logs.delete_one({"_id": result.inserted_id})
+        await server.record_tombstone(USER_ID, "mood_logs", str(result.inserted_id))
+        await server.record_tombstone(str(ObjectId()), "mood_logs", "someone-else")
+        await asyncio.sleep(0.01)
+
+        changes = (await sync(token))["changes"]
+        assert changes["mood_logs"] == {"upserts": [], "deletes": [str(result.inserted_id)]}
+
+    run_in_db(body)